@@ -3,12 +3,15 @@
 import sys
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
 from src.config_loader import load_config, ConfigError
-from src.database import Database
+from src.database import Database, Project, TrendRecord
 from src.github_scraper import GitHubScraper
+from src.history_writer import write_history_file
+from src.logging_setup import start_queue_logging, stop_logging
 from src.ai_filter import AIFilter
 from src.openclaw_notifier import OpenClawNotifier
 from src.wecom_notifier import WeComNotifier
@@ -18,7 +21,6 @@ RECENT_PUSH_LOOKBACK_DAYS = 7
 DAILY_TOOLING_FLOOR = 2
 TOOLING_PRIORITY_CATEGORIES = {"ai_native_tooling", "agent_workflow"}
 
-
 def _notify_agent_llm_failure(
     openclaw_notifier: OpenClawNotifier,
     today: date,
@@ -45,19 +47,9 @@ def _notify_agent_llm_failure(
 def setup_logging(config: dict):
     """Setup logging configuration"""
     log_config = config.get('logging', {})
-    log_file = log_config.get('file', 'logs/app.log')
-    log_level = log_config.get('level', 'INFO')
-
-    # Create logs directory
-    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
-
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
+    start_queue_logging(
+        log_config.get('file', 'logs/app.log'),
+        log_config.get('level', 'INFO'),
     )
 
 
@@ -131,6 +123,7 @@ def run_daily_task(config: dict, dry_run: bool = False):
     scraper = GitHubScraper(
         github_token=github_config.get('token'),
         request_timeout=github_config.get('request_timeout', 60),
+        http_cache=db,
     )
 
     ai_filter = AIFilter(
@@ -139,18 +132,26 @@ def run_daily_task(config: dict, dry_run: bool = False):
         model=config['ai']['model'],
         timeout=config['ai'].get('timeout', 30),
         max_retries=config['ai'].get('max_retries', 1),
+        max_concurrency=config['ai'].get('max_concurrency', 8),
+        requests_per_minute=config['ai'].get('rpm'),
+        tokens_per_minute=config['ai'].get('tpm'),
+        classification_batch_size=config['ai'].get('classification_batch_size', 1),
     )
     notifier = WeComNotifier(config['wecom']['webhook_url'])
     openclaw_notifier = OpenClawNotifier.from_config(config.get('openclaw'))
     today = date.today()
 
     try:
-        # Fetch trending projects
-        logger.info("Fetching daily trending...")
-        daily_projects = scraper.fetch_trending('daily')
-
-        logger.info("Fetching weekly trending...")
-        weekly_projects = scraper.fetch_trending('weekly')
+        # Fetch trending projects (the three pages are independent requests; monthly
+        # only feeds the local markdown appendix but costs nothing extra fetched here)
+        logger.info("Fetching daily, weekly and monthly trending...")
+        with ThreadPoolExecutor(max_workers=3) as fetch_executor:
+            daily_future = fetch_executor.submit(scraper.fetch_trending, 'daily')
+            weekly_future = fetch_executor.submit(scraper.fetch_trending, 'weekly')
+            monthly_future = fetch_executor.submit(scraper.fetch_trending, 'monthly')
+            daily_projects = daily_future.result()
+            weekly_projects = weekly_future.result()
+            monthly_projects = monthly_future.result()
 
         all_projects = merge_trending_projects(daily_projects, weekly_projects)
         logger.info(
@@ -162,7 +163,7 @@ def run_daily_task(config: dict, dry_run: bool = False):
 
         # Filter AI projects
         logger.info("Filtering AI-related projects...")
-        ai_projects = ai_filter.batch_filter(all_projects)
+        ai_projects = classify_with_persistent_cache(ai_filter, db, all_projects)
         logger.info(f"Found {len(ai_projects)} AI-related projects")
 
         if ai_filter.last_filter_had_llm_failure:
@@ -188,38 +189,49 @@ def run_daily_task(config: dict, dry_run: bool = False):
             logger.warning("No new projects to push after 7-day de-duplication, skip push")
             return
 
-        # Generate per-project deep analysis
-        logger.info("Generating per-project deep analysis...")
-        analysis_map = ai_filter.analyze_projects(top_projects)
-
-        # Save to database
-        for project, filter_result in ai_projects:
-            # Save project
-            from src.database import Project, TrendRecord
-
-            db_project = Project(
-                repo_name=project.repo_name,
-                description=project.description,
-                language=project.language,
-                url=project.url
-            )
-            project_id = db.save_project(db_project)
-
-            # Save trend record
-            record = TrendRecord(
-                project_id=project_id,
-                date=today,
-                stars=project.stars,
-                stars_growth=project.stars_growth,
-                trend_type='daily',
-                ranking=project.ranking,
-                ai_relevance_reason=filter_result.reason
-            )
-            db.save_trend_record(record)
+        # Per-project analysis and the daily summary are independent LLM calls, so run
+        # them in the background while this thread saves the day's records.
+        with ThreadPoolExecutor(max_workers=2) as llm_executor:
+            logger.info("Generating per-project deep analysis...")
+            analysis_future = llm_executor.submit(ai_filter.analyze_projects, top_projects)
+            # Reruns on the same Top list (dry-run, then real push) reuse the stored summary.
+            summary_cache_key = ai_filter.summary_cache_key(top_projects)
+            cached_summary = db.get_cached_summary(summary_cache_key)
+            summary_future = None
+            if cached_summary:
+                logger.info("Reusing cached daily summary for identical top projects")
+            else:
+                logger.info("Generating daily summary and business analysis...")
+                summary_future = llm_executor.submit(ai_filter.generate_daily_summary, top_projects)
+
+            # Save to database (one transaction instead of a commit per row)
+            with db.transaction():
+                # Projects and trend records each go in as one executemany batch
+                project_ids = db.save_projects([
+                    Project(
+                        repo_name=project.repo_name,
+                        description=project.description,
+                        language=project.language,
+                        url=project.url
+                    )
+                    for project, _ in ai_projects
+                ])
+                db.save_trend_records([
+                    TrendRecord(
+                        project_id=project_id,
+                        date=today,
+                        stars=project.stars,
+                        stars_growth=project.stars_growth,
+                        trend_type='daily',
+                        ranking=project.ranking,
+                        ai_relevance_reason=filter_result.reason
+                    )
+                    for project_id, (project, filter_result) in zip(project_ids, ai_projects)
+                ])
+
+            analysis_map = analysis_future.result()
+            summary = cached_summary if summary_future is None else summary_future.result()
 
-        # Generate summary
-        logger.info("Generating daily summary and business analysis...")
-        summary = ai_filter.generate_daily_summary(top_projects)
         if not summary or not summary.strip():
             logger.warning("Daily summary is empty, skip push")
             return
@@ -228,6 +240,8 @@ def run_daily_task(config: dict, dry_run: bool = False):
             if not dry_run:
                 _notify_agent_llm_failure(openclaw_notifier, today, "总结生成")
             return
+        if summary_future is not None:
+            db.save_cached_summary(summary_cache_key, summary)
 
         ai_result_by_repo = {project.repo_name: result for project, result in ai_projects}
         weekly_ranked = [
@@ -236,8 +250,6 @@ def run_daily_task(config: dict, dry_run: bool = False):
             if project.repo_name in ai_result_by_repo
         ]
 
-        logger.info("Fetching monthly trending for local markdown appendix...")
-        monthly_projects = scraper.fetch_trending('monthly')
         monthly_ranked = []
         if monthly_projects:
             logger.info("Filtering monthly AI-related projects for local markdown appendix...")
@@ -247,8 +259,28 @@ def run_daily_task(config: dict, dry_run: bool = False):
                 model=config['ai']['model'],
                 timeout=config['ai'].get('timeout', 30),
                 max_retries=config['ai'].get('max_retries', 1),
+                max_concurrency=config['ai'].get('max_concurrency', 8),
+                # Same API key as the daily filter, so spend from the same RPM/TPM budget.
+                rate_limiter=ai_filter.rate_limiter,
+                classification_batch_size=config['ai'].get('classification_batch_size', 1),
             )
-            monthly_ranked = monthly_filter.batch_filter(monthly_projects)
+            # Most monthly repos were already classified in the daily/weekly batch;
+            # only send the unseen ones to the LLM.
+            classified_repo_names = {project.repo_name for project in all_projects}
+            unseen_monthly = [
+                project for project in monthly_projects
+                if project.repo_name not in classified_repo_names
+            ]
+            monthly_result_by_repo = {
+                project.repo_name: result
+                for project, result in classify_with_persistent_cache(monthly_filter, db, unseen_monthly)
+            }
+            monthly_result_by_repo.update(ai_result_by_repo)
+            monthly_ranked = [
+                (project, monthly_result_by_repo[project.repo_name])
+                for project in monthly_projects
+                if project.repo_name in monthly_result_by_repo
+            ]
             logger.info("Found %s AI-related monthly trending projects for appendix", len(monthly_ranked))
 
         # Generate report content
@@ -266,14 +298,23 @@ def run_daily_task(config: dict, dry_run: bool = False):
         history_dir.mkdir(exist_ok=True)
         history_file = history_dir / f"{today.isoformat()}-daily.md"
 
-        try:
-            with open(history_file, 'w', encoding='utf-8') as f:
-                f.write(report_content)
-            logger.info(f"✓ Daily report saved to {history_file}")
-        except Exception as e:
-            logger.error(f"Failed to save history: {e}")
+        # The history write is pure disk I/O; overlap it with the WeCom round-trips.
+        # Push records still wait for WeCom success, OpenClaw for the file on disk.
+        with ThreadPoolExecutor(max_workers=1) as history_executor:
+            history_future = history_executor.submit(write_history_file, history_file, report_content)
 
-        logger.info(f"Sending top {len(top_projects)} projects and summary to WeCom")
+            logger.info(f"Sending top {len(top_projects)} projects and summary to WeCom")
+            wecom_success = False
+            if not dry_run:
+                wecom_success = notifier.send_daily_report_split(
+                    top_projects, today, summary, analysis_map=analysis_map
+                )
+
+            try:
+                history_future.result()
+                logger.info(f"✓ Daily report saved to {history_file}")
+            except Exception as e:
+                logger.error(f"Failed to save history: {e}")
 
         if dry_run:
             print("\n🔍 DRY RUN - Would send the following message:\n")
@@ -281,9 +322,6 @@ def run_daily_task(config: dict, dry_run: bool = False):
             if openclaw_notifier.is_enabled:
                 print(f"\n📎 DRY RUN - Would send markdown attachment via OpenClaw: {history_file}")
         else:
-            wecom_success = notifier.send_daily_report_split(
-                top_projects, today, summary, analysis_map=analysis_map
-            )
             if wecom_success:
                 pushed_repo_names = [project.repo_name for project, _ in top_projects]
                 db.save_daily_push_records(pushed_repo_names, today)
@@ -312,19 +350,30 @@ def run_daily_task(config: dict, dry_run: bool = False):
         raise
 
     finally:
+        notifier.close()
         db.close()
 
 
+def classify_with_persistent_cache(ai_filter: AIFilter, db: Database, projects: list) -> list[tuple]:
+    """Run batch_filter with LLM answers from earlier runs preloaded, then persist new ones."""
+    cache_keys = [ai_filter.classification_cache_key(project) for project in projects]
+    ai_filter.seed_classification_cache(db.get_cached_classifications(cache_keys))
+    try:
+        return ai_filter.batch_filter(projects)
+    finally:
+        db.save_cached_classifications(ai_filter.pop_fresh_classifications())
+
+
 def select_daily_projects_for_push(
     ai_projects: list[tuple],
     db: Database,
     today: date
 ) -> list[tuple]:
     """Select Top10 daily projects, while giving AI-native tooling enough exposure."""
-    recent_pushed = db.get_recently_pushed_repo_names(
+    recent_pushed = frozenset(db.get_recently_pushed_repo_names(
         lookback_days=RECENT_PUSH_LOOKBACK_DAYS,
         reference_date=today
-    )
+    ))
     candidates = [
         item for item in ai_projects
         if item[0].repo_name not in recent_pushed
@@ -403,6 +452,8 @@ def main():
     except Exception as e:
         logging.getLogger(__name__).error(f"Fatal error: {e}", exc_info=True)
         return 1
+    finally:
+        stop_logging()
 
 
 if __name__ == '__main__':
@@ -1,12 +1,18 @@
 """AI project filter using LLM"""
+import hashlib
 import json
 import logging
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 
 from src.github_scraper import TrendingProject
-from src.shared_llm import call_shared_llm
+from src.rate_limiter import TokenBucketRateLimiter
+from src.shared_llm import call_shared_llm, is_transient_llm_error, llm_retry_delay
 
 
 logger = logging.getLogger(__name__)
@@ -22,6 +28,41 @@ SUMMARY_BLOCKLIST = (
 )
 
 
+_JSON_OBJECT_PATTERN = re.compile(r"\{.*\}", re.S)
+_SUMMARY_BLOCKLIST_PATTERN = re.compile("|".join(map(re.escape, SUMMARY_BLOCKLIST)))
+
+
+def _parse_json_response(content: str) -> dict:
+    """Parse a JSON object from LLM output, tolerating code fences or extra prose."""
+    text = (content or "").strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        match = _JSON_OBJECT_PATTERN.search(text)
+        if not match:
+            raise
+        return json.loads(match.group(0))
+
+
+_KEYWORD_BOUNDARY_BEFORE = r"(?<!\\w)"
+_KEYWORD_BOUNDARY_AFTER = r"(?!\\w)"
+
+
+@lru_cache(maxsize=None)
+def _compile_keyword_matchers(keywords: tuple[str, ...]):
+    """Compile a keyword list into one reject-fast alternation plus per-keyword patterns."""
+    combined = re.compile(
+        _KEYWORD_BOUNDARY_BEFORE
+        + "(?:" + "|".join(re.escape(keyword) for keyword in keywords) + ")"
+        + _KEYWORD_BOUNDARY_AFTER
+    )
+    patterns = tuple(
+        (keyword, re.compile(_KEYWORD_BOUNDARY_BEFORE + re.escape(keyword) + _KEYWORD_BOUNDARY_AFTER))
+        for keyword in keywords
+    )
+    return combined, patterns
+
+
 @dataclass
 class FilterResult:
     """AI filter result"""
@@ -37,6 +78,8 @@ class HeuristicAssessment:
     reason: str
     category: str = ""
     score: int = 0
+    # Signal is unambiguous enough that the LLM round-trip can be skipped.
+    confident: bool = False
 
 
 @dataclass
@@ -68,6 +111,16 @@ class AIFilter:
         'llm runtime', 'agent runtime', 'tool calling', 'context engineering'
     ]
 
+    # Framework names that only ever show up in AI projects.
+    FAST_PATH_KEYWORDS = [
+        'pytorch', 'tensorflow', 'langchain', 'stable diffusion'
+    ]
+
+    # Markup/script repos with a terse description and zero AI signal are
+    # reliably non-AI, so they skip the LLM as well.
+    NEGATIVE_FAST_PATH_LANGUAGES = frozenset({'css', 'html', 'shell'})
+    NEGATIVE_FAST_PATH_MAX_DESCRIPTION = 40
+
     AGENT_KEYWORDS = [
         'agent', 'agents', 'agentic', 'assistant', 'copilot', 'autonomous',
         'workflow', 'orchestration', 'memory', 'skills', 'tool calling',
@@ -89,7 +142,105 @@ class AIFilter:
         'vision', 'ocr', 'asr', 'tts'
     ]
 
-    def __init__(self, base_url: str, api_key: str, model: str, timeout: int = 30, max_retries: int = 1):
+    # Static prompt parts are built once; only the three project fields vary per call.
+    CLASSIFICATION_SYSTEM_PROMPT = "你是AI项目识别专家，能识别显性AI项目及AI-native工具链/Agent基础设施。"
+    CLASSIFICATION_CRITERIA = (
+        "判断GitHub项目是否与AI相关。模型/训练/推理/Agent/RAG/视觉/语音/多模态，"
+        "以及面向AI/Agent的基础设施、运行时、浏览器/CLI/桌面自动化工具、AI-native开发工具都算AI相关。\n\n"
+    )
+    # Everything before the project fields is byte-identical across calls so that
+    # prefix-caching backends can reuse it; keep the JSON schema line up front.
+    CLASSIFICATION_PROMPT_TEMPLATE = (
+        CLASSIFICATION_CRITERIA
+        + '只返回JSON：{{"is_ai_related": true/false, "reason": "≤30字理由"}}\n\n'
+        "项目：{repo_name}\n"
+        "描述：{description}\n"
+        "语言：{language}"
+    )
+    CLASSIFICATION_BATCH_PROMPT_TEMPLATE = (
+        CLASSIFICATION_CRITERIA
+        + '只返回JSON：{{"results": [{{"idx": 序号, "is_ai_related": true/false, "reason": "≤30字理由"}}]}}\n\n'
+        + "逐个判断以下项目（序号. 项目 | 描述 | 语言）：\n{project_lines}"
+    )
+    # Part of every classification cache key, so editing the prompts invalidates old answers.
+    CLASSIFICATION_PROMPT_FINGERPRINT = hashlib.blake2b(
+        "\0".join((
+            CLASSIFICATION_SYSTEM_PROMPT,
+            CLASSIFICATION_PROMPT_TEMPLATE,
+            CLASSIFICATION_BATCH_PROMPT_TEMPLATE,
+        )).encode("utf-8"),
+        digest_size=8,
+    ).hexdigest()
+    # Analysis/summary prompts likewise put all fixed instructions before the project list.
+    ANALYSIS_SYSTEM_PROMPT = "你是一个资深开源项目分析师，擅长准确概括项目的核心价值和局限性。"
+    ANALYSIS_PROMPT_PREFIX = """分析文末给出的 GitHub 热门 AI 项目，对每个项目给出深度分析。
+
+对每个项目严格按如下 JSON 格式返回分析结果：
+{
+  "owner/repo-name": {
+    "features": "一句话准确描述项目是什么、核心功能是什么（30-80字）",
+    "advantages": "该项目或该类工具的核心优势（20-50字）",
+    "disadvantages": "该项目的局限或风险（20-50字）",
+    "recommendation": "推荐关注的理由（20-50字）"
+  }
+}
+
+硬性要求：
+- features 必须准确反映项目真实功能，不要套模板、不要泛泛而谈。
+- advantages/disadvantages 要具体到该项目的领域，不要写"提高效率"这种万能话术。
+- recommendation 要有针对性。
+- 只返回 JSON，不要有任何其他文字。
+"""
+    SUMMARY_SYSTEM_PROMPT = "你是一个资深技术专家，擅长评估开源项目对企业业务的价值。"
+    SUMMARY_PROMPT_PREFIX = """分析文末给出的今日 GitHub 热门 AI 项目列表。
+
+只输出最终 Markdown 正文，不要输出任何解释、前言、后记、代码块、系统提示、路径、工具名、技能名、沙箱信息或多余说明。
+
+严格按照下面模板输出，且只能输出这两个标题下的正文：
+
+## 每日趋势总结
+- <第1条，概括今天最明显的技术热点，20-40字>
+- <第2条，概括产品/工程化方向变化，20-40字>
+- <第3条，概括值得关注的落地方向，20-40字>
+
+🚀 **搜狐业务价值分析**
+- **项目名**
+  - **搜索引擎**：<仅在确有价值时填写>
+  - **推荐系统**：<仅在确有价值时填写>
+  - **AI基础设施**：<仅在确有价值时填写>
+
+硬性要求：
+- 只能基于给定项目列表作答，不要编造未出现的项目。
+- `## 每日趋势总结` 下必须恰好输出 3 条 bullet，不要写成长段落。
+- `🚀 **搜狐业务价值分析**` 只分析确实有明确价值的项目；没有价值的项目不要硬写。若整体都没有明确价值，只输出一条：`- 暂未发现明确可直接落地的项目`。
+- 不要出现“根据要求”“下面是”“我认为”“我按说明”等元话术。
+- 不要出现 `using-superpowers`、`SKILL.md`、`/Users/`、`沙箱`、`工具`、`系统提示` 等词。
+- 不要输出项目链接、参考资料、附注、免责声明。
+- 不要省略标题，不要增加第三个标题。
+"""
+    # The first sentences decide the category; longer text only adds tokens and latency.
+    CLASSIFICATION_DESCRIPTION_LIMIT = 160
+    # Attempts per LLM call (and backoff cap in seconds) on transient upstream errors.
+    LLM_RETRY_MAX_ATTEMPTS = 5
+    LLM_RETRY_BACKOFF_MAX = 60.0
+    # Rough completion sizes used to reserve TPM budget before each call.
+    CLASSIFICATION_COMPLETION_TOKENS = 64
+    ANALYSIS_COMPLETION_TOKENS = 2048
+    SUMMARY_COMPLETION_TOKENS = 1024
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        model: str,
+        timeout: int = 30,
+        max_retries: int = 1,
+        max_concurrency: int = 8,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        classification_batch_size: int = 1,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+    ):
         """
         Initialize AI filter
 
@@ -99,12 +250,27 @@ class AIFilter:
             model: Model name
             timeout: Request timeout in seconds
             max_retries: Max attempts for summary generation
+            max_concurrency: Max in-flight LLM classification calls in batch_filter
+            requests_per_minute: Client-side RPM cap for all LLM calls (None = unlimited)
+            tokens_per_minute: Client-side TPM cap for all LLM calls (None = unlimited)
+            classification_batch_size: Projects per LLM classification prompt in batch_filter (1 = one call each)
+            rate_limiter: Limiter shared with other LLM clients on the same key; overrides the RPM/TPM caps
         """
         self.base_url = (base_url or "").strip()
         self.api_key = (api_key or "").strip()
         self.model = model
         self.timeout = max(1, int(timeout))
         self.max_retries = max(1, int(max_retries))
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.classification_batch_size = max(1, int(classification_batch_size))
+        # Raw LLM classification answers, so repeated projects skip the round-trip.
+        self._classification_cache: dict[str, dict] = {}
+        # Keys answered by the LLM in this process, for persisting to the DB cache.
+        self._fresh_classification_keys: set[str] = set()
+        # Caps in-flight LLM calls from this filter, whatever thread pool issues them.
+        self._llm_slots = threading.BoundedSemaphore(self.max_concurrency)
+        # Paces calls under the provider's RPM/TPM caps so fan-out does not trip 429s.
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter(requests_per_minute, tokens_per_minute)
         # Per-run health flags. main.py uses them to decide whether to push.
         self.last_filter_had_llm_failure = False
         self.last_summary_had_llm_failure = False
@@ -120,35 +286,22 @@ class AIFilter:
             FilterResult with is_ai_related flag and reason
         """
         heuristic = self._assess_project(project)
-
-        try:
-            prompt = f"""判断以下GitHub项目是否与AI相关。除了模型、训练、推理、Agent、RAG、计算机视觉、语音、多模态，也要把“面向 AI/Agent 的基础设施、运行时、浏览器/CLI/桌面自动化工具、AI-native developer tools”视为 AI 相关项目，而不是只盯着模型类仓库。
-
-项目名：{project.repo_name}
-描述：{project.description}
-语言：{project.language}
-
-请返回JSON格式：{{"is_ai_related": true/false, "reason": "判断理由"}}"""
-
-            content = call_shared_llm(
-                prompt,
-                system_prompt="你是一个AI项目识别专家，既能识别显性AI项目，也能识别 AI-native tooling / agent infrastructure / developer tools。",
-                model=self.model,
-                temperature=0.3,
-                timeout=self.timeout,
-                base_url=self.base_url,
-                api_key=self.api_key,
-                reasoning_effort="xhigh",
+        if heuristic.confident:
+            logger.debug("Keyword fast-path for %s, skip LLM classification", project.repo_name)
+            return FilterResult(
+                is_ai_related=heuristic.is_ai_related,
+                reason=heuristic.reason or "无AI相关信号的前端/脚本类项目（关键词预判）",
+                category=heuristic.category,
             )
 
-            # Clean up markdown code blocks if present
-            if content.startswith("```"):
-                content = content.strip().strip("`")
-                if content.startswith("json"):
-                    content = content[4:]
-                content = content.strip()
+        try:
+            cache_key = self.classification_cache_key(project)
+            result = self._classification_cache.get(cache_key)
+            if result is None:
+                result = self._request_llm_classification(project)
+                self._classification_cache[cache_key] = result
+                self._fresh_classification_keys.add(cache_key)
 
-            result = json.loads(content)
             llm_result = FilterResult(
                 is_ai_related=result.get('is_ai_related', False),
                 reason=result.get('reason', ''),
@@ -187,6 +340,98 @@ class AIFilter:
                 category=heuristic.category,
             )
 
+    def _request_llm_classification(self, project: TrendingProject) -> dict:
+        """Ask the LLM whether a project is AI-related and return the parsed JSON."""
+        prompt = self.CLASSIFICATION_PROMPT_TEMPLATE.format(
+            repo_name=project.repo_name,
+            description=(project.description or "")[:self.CLASSIFICATION_DESCRIPTION_LIMIT],
+            language=project.language,
+        )
+
+        content = self._call_llm(
+            prompt,
+            system_prompt=self.CLASSIFICATION_SYSTEM_PROMPT,
+            temperature=0.3,
+            completion_tokens=self.CLASSIFICATION_COMPLETION_TOKENS,
+            label=f"classification of {project.repo_name}",
+        )
+        return _parse_json_response(content)
+
+    def _call_llm(
+        self,
+        prompt: str,
+        *,
+        system_prompt: str,
+        temperature: float,
+        completion_tokens: int,
+        label: str,
+    ) -> str:
+        """
+        Call the shared LLM under the rate limiter and concurrency cap.
+
+        Transient failures (429/5xx/timeouts) are retried with jittered exponential
+        backoff, honouring Retry-After when the error carries one; anything else,
+        or the last failed attempt, is re-raised for the caller's fallback.
+        """
+        for attempt in range(1, self.LLM_RETRY_MAX_ATTEMPTS + 1):
+            try:
+                self._reserve_llm_budget(prompt, completion_tokens)
+                with self._llm_slots:
+                    return call_shared_llm(
+                        prompt,
+                        system_prompt=system_prompt,
+                        model=self.model,
+                        temperature=temperature,
+                        timeout=self.timeout,
+                        base_url=self.base_url,
+                        api_key=self.api_key,
+                        reasoning_effort="xhigh",
+                    )
+            except Exception as e:
+                if attempt >= self.LLM_RETRY_MAX_ATTEMPTS or not is_transient_llm_error(e):
+                    raise
+                delay = self._retry_delay(attempt, e)
+                logger.info(
+                    "LLM %s hit a transient error (attempt %s/%s), retry in %.1fs: %s",
+                    label,
+                    attempt,
+                    self.LLM_RETRY_MAX_ATTEMPTS,
+                    delay,
+                    e,
+                )
+                time.sleep(delay)
+
+    def _reserve_llm_budget(self, prompt: str, completion_tokens: int) -> None:
+        """Block until the rate limiter admits one call of roughly this size."""
+        self.rate_limiter.acquire_for_prompt(prompt, completion_tokens)
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """Retry-After if given, else 1s, 2s, 4s... (capped) with +/-25% jitter."""
+        return llm_retry_delay(attempt, error, self.LLM_RETRY_BACKOFF_MAX)
+
+    def classification_cache_key(self, project: TrendingProject) -> str:
+        """Stable key for an LLM classification of this exact project text under this model and prompt."""
+        raw = (
+            f"{self.model}|{self.CLASSIFICATION_PROMPT_FINGERPRINT}|"
+            f"{project.repo_name}|{project.description}|{project.language}"
+        )
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def seed_classification_cache(self, entries: dict[str, dict]) -> None:
+        """Preload LLM answers persisted by earlier runs (see Database.get_cached_classifications)."""
+        for cache_key, result in entries.items():
+            self._classification_cache.setdefault(cache_key, result)
+
+    def pop_fresh_classifications(self) -> dict[str, dict]:
+        """Return LLM answers obtained since the last call, for persisting."""
+        fresh = {
+            cache_key: self._classification_cache[cache_key]
+            for cache_key in self._fresh_classification_keys
+            if cache_key in self._classification_cache
+        }
+        self._fresh_classification_keys.clear()
+        return fresh
+
     def _keyword_fallback(self, text: str) -> bool:
         """Fallback keyword-based detection"""
         return self._assess_text(text).is_ai_related
@@ -200,27 +445,52 @@ class AIFilter:
             ] if part
         )
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _all_signal_keywords(cls) -> tuple[str, ...]:
+        """Union of every keyword list that feeds the heuristic score, deduplicated."""
+        return tuple(dict.fromkeys([
+            *cls.STRONG_AI_PHRASES,
+            *cls.AI_KEYWORDS,
+            *cls.AGENT_KEYWORDS,
+            *cls.TOOLING_KEYWORDS,
+            *cls.MODEL_KEYWORDS,
+            *cls.FAST_PATH_KEYWORDS,
+        ]))
+
     def _collect_hits(self, text_lower: str, keywords: list[str]) -> list[str]:
-        hits = []
-        for keyword in keywords:
-            pattern = r"(?<!\\w)" + re.escape(keyword) + r"(?!\\w)"
-            if re.search(pattern, text_lower):
-                hits.append(keyword)
-        return hits
+        combined, patterns = _compile_keyword_matchers(tuple(keywords))
+        if not combined.search(text_lower):
+            return []
+        return [keyword for keyword, pattern in patterns if pattern.search(text_lower)]
 
     def _assess_project(self, project: TrendingProject) -> HeuristicAssessment:
-        return self._assess_text(self._compose_project_text(project))
+        assessment = self._assess_text(self._compose_project_text(project))
+        if (
+            assessment.score == 0
+            and (project.language or "").lower() in self.NEGATIVE_FAST_PATH_LANGUAGES
+            and len((project.description or "").strip()) < self.NEGATIVE_FAST_PATH_MAX_DESCRIPTION
+        ):
+            assessment.confident = True
+        return assessment
 
     def _assess_text(self, text: str) -> HeuristicAssessment:
         text_lower = (text or "").lower()
         if not text_lower.strip():
             return HeuristicAssessment(False, "", "", 0)
 
+        # One scan over every keyword list rejects the common no-signal case
+        # before the six per-list scans below.
+        any_signal, _ = _compile_keyword_matchers(self._all_signal_keywords())
+        if not any_signal.search(text_lower):
+            return HeuristicAssessment(False, "", "", 0)
+
         strong_hits = self._collect_hits(text_lower, self.STRONG_AI_PHRASES)
         core_hits = self._collect_hits(text_lower, self.AI_KEYWORDS)
         agent_hits = self._collect_hits(text_lower, self.AGENT_KEYWORDS)
         tooling_hits = self._collect_hits(text_lower, self.TOOLING_KEYWORDS)
         model_hits = self._collect_hits(text_lower, self.MODEL_KEYWORDS)
+        fast_path_hits = self._collect_hits(text_lower, self.FAST_PATH_KEYWORDS)
 
         has_strong_signal = bool(strong_hits)
         has_core_signal = bool(core_hits)
@@ -271,7 +541,8 @@ class AIFilter:
         else:
             reason = "该项目在描述中命中了明确 AI 信号，属于 AI 相关仓库。"
 
-        return HeuristicAssessment(True, reason, category, score)
+        confident = has_strong_signal or bool(fast_path_hits)
+        return HeuristicAssessment(True, reason, category, score, confident)
 
     def batch_filter(self, projects: List[TrendingProject]) -> List[tuple[TrendingProject, FilterResult]]:
         """
@@ -286,8 +557,19 @@ class AIFilter:
         self.last_filter_had_llm_failure = False
         results = []
 
-        for project in projects:
-            result = self.is_ai_related(project)
+        if self.classification_batch_size > 1:
+            self._prefetch_batched_classifications(projects)
+
+        # Each classification is an independent LLM round-trip, so fan them out
+        # and keep the input order when collecting results.
+        workers = min(self.max_concurrency, len(projects))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                filter_results = list(executor.map(self.is_ai_related, projects))
+        else:
+            filter_results = [self.is_ai_related(project) for project in projects]
+
+        for project, result in zip(projects, filter_results):
             if result.is_ai_related:
                 results.append((project, result))
                 logger.info(f"✓ AI project: {project.repo_name} - {result.reason}")
@@ -296,6 +578,79 @@ class AIFilter:
 
         return results
 
+    def _prefetch_batched_classifications(self, projects: List[TrendingProject]) -> None:
+        """
+        Classify uncached projects several per prompt and seed the classification cache.
+
+        Anything a batch answer misses or garbles stays uncached, so is_ai_related
+        falls back to its usual one-project call for it.
+        """
+        pending = []
+        pending_keys = set()
+        for project in projects:
+            cache_key = self.classification_cache_key(project)
+            if cache_key in self._classification_cache or cache_key in pending_keys:
+                continue
+            if self._assess_project(project).confident:
+                continue
+            pending_keys.add(cache_key)
+            pending.append(project)
+
+        # Stable ordering keeps chunk prompts (and their cacheable prefixes) alike
+        # between runs; verdicts go to the cache by key, so output order is unaffected.
+        pending.sort(key=lambda project: (project.language or "", project.repo_name))
+        size = self.classification_batch_size
+        chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+        chunks = [chunk for chunk in chunks if len(chunk) > 1]
+        if not chunks:
+            return
+
+        workers = min(self.max_concurrency, len(chunks))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(self._classify_chunk, chunks))
+        else:
+            for chunk in chunks:
+                self._classify_chunk(chunk)
+
+    def _classify_chunk(self, chunk: List[TrendingProject]) -> None:
+        """Ask for verdicts on several projects in one prompt and cache the valid ones."""
+        project_lines = "\n".join(
+            f"{idx}. {project.repo_name} | "
+            f"{(project.description or '')[:self.CLASSIFICATION_DESCRIPTION_LIMIT]} | "
+            f"{project.language}"
+            for idx, project in enumerate(chunk, 1)
+        )
+        prompt = self.CLASSIFICATION_BATCH_PROMPT_TEMPLATE.format(project_lines=project_lines)
+
+        try:
+            content = self._call_llm(
+                prompt,
+                system_prompt=self.CLASSIFICATION_SYSTEM_PROMPT,
+                temperature=0.3,
+                completion_tokens=self.CLASSIFICATION_COMPLETION_TOKENS * len(chunk),
+                label=f"batch classification of {len(chunk)} projects",
+            )
+            verdicts = _parse_json_response(content).get("results", [])
+        except Exception as e:
+            logger.warning("Batched LLM classification failed, falling back per project: %s", e)
+            return
+
+        for verdict in verdicts:
+            if not isinstance(verdict, dict):
+                continue
+            idx = verdict.get("idx")
+            if not isinstance(idx, int) or not (1 <= idx <= len(chunk)):
+                continue
+            if not isinstance(verdict.get("is_ai_related"), bool):
+                continue
+            cache_key = self.classification_cache_key(chunk[idx - 1])
+            self._classification_cache[cache_key] = {
+                "is_ai_related": verdict["is_ai_related"],
+                "reason": str(verdict.get("reason") or ""),
+            }
+            self._fresh_classification_keys.add(cache_key)
+
     def analyze_projects(
         self, projects: List[tuple[TrendingProject, FilterResult]]
     ) -> dict[str, ProjectAnalysis]:
@@ -312,45 +667,19 @@ class AIFilter:
         for i, (p, _r) in enumerate(projects, 1):
             project_lines += f"{i}. {p.repo_name}: {p.description} (Language: {p.language})\n"
 
-        prompt = f"""分析以下 GitHub 热门 AI 项目，对每个项目给出深度分析。
-
+        prompt = f"""{self.ANALYSIS_PROMPT_PREFIX}
 项目列表：
-{project_lines}
-对每个项目严格按如下 JSON 格式返回分析结果：
-{{
-  "owner/repo-name": {{
-    "features": "一句话准确描述项目是什么、核心功能是什么（30-80字）",
-    "advantages": "该项目或该类工具的核心优势（20-50字）",
-    "disadvantages": "该项目的局限或风险（20-50字）",
-    "recommendation": "推荐关注的理由（20-50字）"
-  }}
-}}
-
-硬性要求：
-- features 必须准确反映项目真实功能，不要套模板、不要泛泛而谈。
-- advantages/disadvantages 要具体到该项目的领域，不要写"提高效率"这种万能话术。
-- recommendation 要有针对性。
-- 只返回 JSON，不要有任何其他文字。"""
+{project_lines}"""
 
         try:
-            content = call_shared_llm(
+            content = self._call_llm(
                 prompt,
-                system_prompt="你是一个资深开源项目分析师，擅长准确概括项目的核心价值和局限性。",
-                model=self.model,
+                system_prompt=self.ANALYSIS_SYSTEM_PROMPT,
                 temperature=0.4,
-                timeout=self.timeout,
-                base_url=self.base_url,
-                api_key=self.api_key,
-                reasoning_effort="xhigh",
+                completion_tokens=self.ANALYSIS_COMPLETION_TOKENS,
+                label="project analysis",
             )
-            # Clean up markdown code blocks if present
-            if content.startswith("```"):
-                content = content.strip().strip("`")
-                if content.startswith("json"):
-                    content = content[4:]
-                content = content.strip()
-
-            raw = json.loads(content)
+            raw = _parse_json_response(content)
             result = {}
             for p, _ in projects:
                 name = p.repo_name
@@ -373,6 +702,14 @@ class AIFilter:
             logger.warning("LLM project analysis failed, using empty fallback: %s", e)
             return {p.repo_name: ProjectAnalysis() for p, _ in projects}
 
+    def summary_cache_key(self, projects: List[tuple[TrendingProject, FilterResult]]) -> str:
+        """Stable hash of everything that feeds the daily summary prompt."""
+        payload = json.dumps(
+            [self.model, [(p.repo_name, p.description, p.language) for p, _ in projects]],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
     def generate_daily_summary(self, projects: List[tuple[TrendingProject, FilterResult]]) -> str:
         """
         Generate a summary of the provided projects, highlighting relevance to Sohu's business.
@@ -391,47 +728,19 @@ class AIFilter:
         for i, (p, r) in enumerate(projects, 1):
             projects_text += f"{i}. {p.repo_name}: {p.description} (Language: {p.language})\n"
 
-        prompt = f"""
-分析以下今日 GitHub 热门 AI 项目列表：
-
-{projects_text}
+        prompt = f"""{self.SUMMARY_PROMPT_PREFIX}
+今日 GitHub 热门 AI 项目列表：
 
-只输出最终 Markdown 正文，不要输出任何解释、前言、后记、代码块、系统提示、路径、工具名、技能名、沙箱信息或多余说明。
-
-严格按照下面模板输出，且只能输出这两个标题下的正文：
-
-## 每日趋势总结
-- <第1条，概括今天最明显的技术热点，20-40字>
-- <第2条，概括产品/工程化方向变化，20-40字>
-- <第3条，概括值得关注的落地方向，20-40字>
-
-🚀 **搜狐业务价值分析**
-- **项目名**
-  - **搜索引擎**：<仅在确有价值时填写>
-  - **推荐系统**：<仅在确有价值时填写>
-  - **AI基础设施**：<仅在确有价值时填写>
-
-硬性要求：
-- 只能基于给定项目列表作答，不要编造未出现的项目。
-- `## 每日趋势总结` 下必须恰好输出 3 条 bullet，不要写成长段落。
-- `🚀 **搜狐业务价值分析**` 只分析确实有明确价值的项目；没有价值的项目不要硬写。若整体都没有明确价值，只输出一条：`- 暂未发现明确可直接落地的项目`。
-- 不要出现“根据要求”“下面是”“我认为”“我按说明”等元话术。
-- 不要出现 `using-superpowers`、`SKILL.md`、`/Users/`、`沙箱`、`工具`、`系统提示` 等词。
-- 不要输出项目链接、参考资料、附注、免责声明。
-- 不要省略标题，不要增加第三个标题。
-"""
+{projects_text}"""
 
         for attempt in range(1, self.max_retries + 1):
             try:
-                summary_text = call_shared_llm(
+                summary_text = self._call_llm(
                     prompt,
-                    system_prompt="你是一个资深技术专家，擅长评估开源项目对企业业务的价值。",
-                    model=self.model,
+                    system_prompt=self.SUMMARY_SYSTEM_PROMPT,
                     temperature=0.4,
-                    timeout=self.timeout,
-                    base_url=self.base_url,
-                    api_key=self.api_key,
-                    reasoning_effort="xhigh",
+                    completion_tokens=self.SUMMARY_COMPLETION_TOKENS,
+                    label="daily summary",
                 )
                 summary_text = summary_text.strip()
                 if self._is_invalid_summary(summary_text):
@@ -464,8 +773,7 @@ class AIFilter:
         if not text or not text.strip():
             return True
 
-        lower_text = text.lower()
-        return any(marker in lower_text for marker in SUMMARY_BLOCKLIST)
+        return _SUMMARY_BLOCKLIST_PATTERN.search(text.lower()) is not None
 
     def _build_fallback_summary(self, projects: List[tuple[TrendingProject, FilterResult]]) -> str:
         """Build stable summary when LLM output is unavailable or invalid."""
@@ -0,0 +1,40 @@
+"""Keyword rules shared by the daily (WeCom) and weekly highlight rewrites."""
+import re
+from functools import lru_cache
+from typing import Optional
+
+FALLBACK_REASON_PATTERN = re.compile(r"keyword[- ]based detection|llm unavailable", re.IGNORECASE)
+# Zero-width lookahead so keywords may overlap ("ragent" still yields agent), as the
+# old per-keyword substring checks allowed.
+HIGHLIGHT_AREA_PATTERN = re.compile(
+    r"(?=(agent|assistant|copilot|workflow)"
+    r"|(llm|gpt|chat|rag|prompt)"
+    r"|(vision|image|video|multimodal))",
+    re.IGNORECASE,
+)
+HIGHLIGHT_AREAS = ("AI Agent/智能助手方向", "LLM 应用方向", "多模态/视觉方向")
+
+
+def lowest_matching_group(pattern: re.Pattern, *texts: str) -> Optional[int]:
+    """Smallest group index of ``pattern`` matched anywhere in ``texts`` (earlier groups win)."""
+    best = None
+    for text in texts:
+        for match in pattern.finditer(text):
+            if best is None or match.lastindex < best:
+                best = match.lastindex
+                if best == 1:
+                    return best
+    return best
+
+
+@lru_cache(maxsize=1024)
+def normalize_ai_highlight(reason: Optional[str], description: Optional[str] = "") -> str:
+    """Rewrite unreadable fallback reasons into a user-facing Chinese highlight; projects recur, so cached."""
+    normalized = (reason or "").strip()
+    if not normalized or FALLBACK_REASON_PATTERN.search(normalized):
+        # Lowest matching group wins, matching the original agent > LLM > vision order.
+        best = lowest_matching_group(HIGHLIGHT_AREA_PATTERN, description or "")
+        area = HIGHLIGHT_AREAS[best - 1] if best else "AI 应用或工具方向"
+        return f"基于项目描述中的关键词判定，该项目与 {area}相关，建议后续结合 README 做进一步复核。"
+
+    return normalized
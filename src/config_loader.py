@@ -3,10 +3,15 @@ Configuration loader for GitHub AI Trend Tracker.
 Loads and validates YAML configuration files.
 """
 
+import copy
+from functools import lru_cache
 import yaml
 from pathlib import Path
 from typing import Dict, Any
 
+# libyaml's C loader when PyYAML was built with it; same safe semantics, much faster.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ConfigError(Exception):
     """Custom exception for configuration errors"""
@@ -31,9 +36,19 @@ def load_config(config_path: str) -> Dict[str, Any]:
     if not config_file.exists():
         raise ConfigError(f"Configuration file not found: {config_path}")
 
+    # Re-read only when the file changes; callers get their own copy to mutate.
+    resolved = config_file.resolve()
+    return copy.deepcopy(_load_config_cached(str(resolved), resolved.stat().st_mtime_ns))
+
+
+@lru_cache(maxsize=4)
+def _load_config_cached(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse and validate a config file; keyed by path and mtime so edits are picked up."""
+    config_file = Path(config_path)
+
     try:
         with open(config_file, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
     except yaml.YAMLError as e:
         raise ConfigError(f"Invalid YAML in configuration file: {e}")
     except (IOError, PermissionError) as e:
@@ -71,4 +86,11 @@ def load_config(config_path: str) -> Dict[str, Any]:
     if not isinstance(tasks.get('weekly_hour'), int) or not (0 <= tasks['weekly_hour'] <= 23):
         raise ConfigError("tasks.weekly_hour must be an integer between 0 and 23")
 
+    ai = config['ai']
+    for field in ('rpm', 'tpm'):
+        value = ai.get(field)
+        # bool is an int subclass; YAML "true" must not become a 1-per-minute limit.
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 1):
+            raise ConfigError(f"ai.{field} must be a positive integer")
+
     return config
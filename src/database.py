@@ -1,5 +1,6 @@
 """Database operations module"""
 import sqlite3
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import date, timedelta
 from typing import Optional, List
@@ -31,18 +32,86 @@ class TrendRecord:
 
 
 class Database:
-    """Database manager"""
+    """
+    Database manager
+
+    Writes that belong together should run inside ``transaction()``: the outermost
+    block is one BEGIN IMMEDIATE/COMMIT (one WAL sync), and nested blocks become
+    savepoints, so the batch helpers can be grouped freely by callers.
+    """
+
+    # Per-connection tuning: ~20MB page cache, in-memory temp tables, 256MB mmap reads.
+    CONNECTION_PRAGMAS = (
+        "PRAGMA cache_size=-20000",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+    )
+
+    # Stored in PRAGMA user_version once init_db has built the schema; bump it whenever
+    # init_db gains a table or index so existing databases run the full setup again.
+    SCHEMA_VERSION = 1
+
+    # Keys per IN (...) lookup (save_projects ids, cached classifications);
+    # well under SQLite's 999-parameter floor.
+    ID_LOOKUP_CHUNK = 500
 
     def __init__(self, db_path: str = "data/trends.db"):
         """Initialize database connection"""
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(db_path)
+        # Autocommit at the driver level: transaction() issues BEGIN IMMEDIATE/COMMIT
+        # itself, so grouped writes take the write lock up front instead of on first DML.
+        self.conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        if db_path != ":memory:":
+            # WAL lets readers (e.g. --stats) proceed while the daily save loop writes,
+            # and NORMAL sync is durable enough under WAL with far fewer fsyncs.
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        for pragma in self.CONNECTION_PRAGMAS:
+            self.conn.execute(pragma)
+        self._savepoint_depth = 0
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into a single commit, rolling back on error.
+
+        Inside an already open transaction this is a savepoint instead: an error
+        undoes only the inner block's writes, and the outer commit covers the rest.
+        """
+        if self.conn.in_transaction:
+            self._savepoint_depth += 1
+            savepoint = f"sp_{self._savepoint_depth}"
+            self.conn.execute(f"SAVEPOINT {savepoint}")
+            try:
+                yield self
+                self.conn.execute(f"RELEASE {savepoint}")
+            except BaseException:
+                self.conn.execute(f"ROLLBACK TO {savepoint}")
+                self.conn.execute(f"RELEASE {savepoint}")
+                raise
+            finally:
+                self._savepoint_depth -= 1
+            return
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
 
     def init_db(self):
         """Initialize database schema"""
         cursor = self.conn.cursor()
 
+        # Schema already current: skip the DDL and full ANALYZE, and let SQLite
+        # refresh planner statistics only for tables that have changed enough.
+        if cursor.execute("PRAGMA user_version").fetchone()[0] == self.SCHEMA_VERSION:
+            cursor.execute("PRAGMA optimize")
+            return
+
         # Projects table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS projects (
@@ -85,6 +154,12 @@ class Database:
             )
         """)
 
+        # Serves the per-date GROUP BY in --stats and weekly date-range scans
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trend_records_date
+            ON trend_records(date)
+        """)
+
         # Daily push records table (actual pushed repos history)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS daily_push_records (
@@ -96,29 +171,91 @@ class Database:
             )
         """)
 
-        self.conn.commit()
+        # Covers the recent-push window lookup (pushed_date range -> repo_name) index-only
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_daily_push_records_pushed_date
+            ON daily_push_records(pushed_date, repo_name)
+        """)
+
+        # Conditional-GET cache for GitHub trending pages
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS trending_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body TEXT NOT NULL,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # LLM classification cache (raw is_ai_related answers keyed by model + project text)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS classification_cache (
+                cache_key TEXT PRIMARY KEY,
+                is_ai_related INTEGER NOT NULL,
+                reason TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # LLM daily summary cache (keyed by model + top-project inputs)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS llm_summary_cache (
+                cache_key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Refresh planner statistics so the range queries pick the date indexes
+        cursor.execute("ANALYZE")
+        cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
 
     def save_project(self, project: Project) -> int:
-        """Save project to database"""
+        """Save project to database, returning its id (existing rows get a fresh description)"""
         cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT INTO projects (repo_name, description, language, url, first_seen)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(repo_name) DO UPDATE SET description = excluded.description
+            RETURNING id
+        """, (
+            project.repo_name,
+            project.description,
+            project.language,
+            project.url,
+            project.first_seen or date.today()
+        ))
+        return cursor.fetchone()[0]
 
-        try:
-            cursor.execute("""
+    def save_projects(self, projects: List[Project]) -> List[int]:
+        """Save many projects with one prepared upsert, returning their ids in input order"""
+        if not projects:
+            return []
+
+        today = date.today()
+        with self.transaction():
+            self.conn.executemany("""
                 INSERT INTO projects (repo_name, description, language, url, first_seen)
                 VALUES (?, ?, ?, ?, ?)
-            """, (
-                project.repo_name,
-                project.description,
-                project.language,
-                project.url,
-                project.first_seen or date.today()
-            ))
-            self.conn.commit()
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            # Project already exists, return existing ID
-            cursor.execute("SELECT id FROM projects WHERE repo_name = ?", (project.repo_name,))
-            return cursor.fetchone()[0]
+                ON CONFLICT(repo_name) DO UPDATE SET description = excluded.description
+            """, [
+                (project.repo_name, project.description, project.language, project.url,
+                 project.first_seen or today)
+                for project in projects
+            ])
+
+            # executemany cannot hand back RETURNING rows, so look the ids up in chunks
+            # that stay under SQLite's bound-parameter limit.
+            names = list(dict.fromkeys(project.repo_name for project in projects))
+            id_by_name = {}
+            for start in range(0, len(names), self.ID_LOOKUP_CHUNK):
+                chunk = names[start:start + self.ID_LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                id_by_name.update(self.conn.execute(
+                    f"SELECT repo_name, id FROM projects WHERE repo_name IN ({placeholders})", chunk
+                ).fetchall())
+        return [id_by_name[project.repo_name] for project in projects]
 
     def get_project_by_name(self, repo_name: str) -> Optional[Project]:
         """Get project by repository name"""
@@ -139,32 +276,53 @@ class Database:
         )
 
     def save_trend_record(self, record: TrendRecord) -> int:
-        """Save trend record to database"""
+        """Save trend record to database, refreshing stars/growth if it already exists"""
         cursor = self.conn.cursor()
+        # Same conflict update as save_trend_records, so either path leaves identical rows.
+        cursor.execute("""
+            INSERT INTO trend_records
+            (project_id, date, stars, stars_growth, trend_type, ranking, ai_relevance_reason)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(project_id, date, trend_type) DO UPDATE SET
+                stars = excluded.stars,
+                stars_growth = excluded.stars_growth
+            RETURNING id
+        """, (
+            record.project_id,
+            record.date.isoformat(),
+            record.stars,
+            record.stars_growth,
+            record.trend_type,
+            record.ranking,
+            record.ai_relevance_reason
+        ))
+        return cursor.fetchone()[0]
 
-        try:
-            cursor.execute("""
+    def save_trend_records(self, records: List[TrendRecord]) -> None:
+        """Save many trend records with one prepared statement, refreshing existing rows' stars/growth."""
+        if not records:
+            return
+
+        with self.transaction():
+            self.conn.executemany("""
                 INSERT INTO trend_records
                 (project_id, date, stars, stars_growth, trend_type, ranking, ai_relevance_reason)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                record.project_id,
-                record.date.isoformat(),
-                record.stars,
-                record.stars_growth,
-                record.trend_type,
-                record.ranking,
-                record.ai_relevance_reason
-            ))
-            self.conn.commit()
-            return cursor.lastrowid
-        except sqlite3.IntegrityError:
-            # Record already exists for this project/date/type
-            cursor.execute("""
-                SELECT id FROM trend_records
-                WHERE project_id = ? AND date = ? AND trend_type = ?
-            """, (record.project_id, record.date.isoformat(), record.trend_type))
-            return cursor.fetchone()[0]
+                ON CONFLICT(project_id, date, trend_type) DO UPDATE SET
+                    stars = excluded.stars,
+                    stars_growth = excluded.stars_growth
+            """, [
+                (
+                    record.project_id,
+                    record.date.isoformat(),
+                    record.stars,
+                    record.stars_growth,
+                    record.trend_type,
+                    record.ranking,
+                    record.ai_relevance_reason
+                )
+                for record in records
+            ])
 
     def get_weekly_trends(self, start_date: date, end_date: date) -> List[dict]:
         """Get all AI trend records for a week"""
@@ -177,26 +335,53 @@ class Database:
             ORDER BY tr.stars_growth DESC, tr.stars DESC
         """, (start_date.isoformat(), end_date.isoformat()))
 
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in cursor]
+
+    def get_weekly_top_projects(self, start_date: date, end_date: date, limit: int) -> List[dict]:
+        """
+        Get the week's top projects, one row per project.
+
+        Keeps each project's highest-stars record (ties broken by growth) and
+        returns the best ``limit`` of those by stars growth, then stars.
+        """
+        # Outer columns are listed so record_rank never reaches the rows; build dicts
+        # straight from the cursor instead of copying and pruning each one.
+        cursor = self.conn.execute("""
+            SELECT id, repo_name, description, language, url, first_seen, created_at,
+                   stars, stars_growth, date, ai_relevance_reason, ranking
+            FROM (
+                SELECT p.*, tr.stars, tr.stars_growth, tr.date, tr.ai_relevance_reason, tr.ranking,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY p.id ORDER BY tr.stars DESC, tr.stars_growth DESC
+                       ) AS record_rank
+                FROM projects p
+                JOIN trend_records tr ON p.id = tr.project_id
+                WHERE tr.date >= ? AND tr.date <= ?
+            )
+            WHERE record_rank = 1
+            ORDER BY stars_growth DESC, stars DESC
+            LIMIT ?
+        """, (start_date.isoformat(), end_date.isoformat(), limit))
+
+        return [dict(row) for row in cursor]
 
     def save_daily_push_records(self, repo_names: List[str], pushed_date: date) -> None:
         """Save daily pushed repo names for de-duplication in next days."""
         if not repo_names:
             return
 
-        cursor = self.conn.cursor()
         values = [(repo_name, pushed_date.isoformat()) for repo_name in repo_names]
-        cursor.executemany("""
-            INSERT OR IGNORE INTO daily_push_records (repo_name, pushed_date)
-            VALUES (?, ?)
-        """, values)
-        self.conn.commit()
+        with self.transaction():
+            self.conn.executemany("""
+                INSERT OR IGNORE INTO daily_push_records (repo_name, pushed_date)
+                VALUES (?, ?)
+            """, values)
 
     def get_recently_pushed_repo_names(
         self,
         lookback_days: int = 7,
         reference_date: Optional[date] = None
-    ) -> set[str]:
+    ) -> frozenset[str]:
         """
         Get repo names pushed within lookback window before reference date.
 
@@ -208,7 +393,7 @@ class Database:
             reference_date = date.today()
 
         if lookback_days < 1:
-            return set()
+            return frozenset()
 
         window_start = reference_date - timedelta(days=lookback_days - 1)
         cursor = self.conn.cursor()
@@ -218,7 +403,86 @@ class Database:
             WHERE pushed_date >= ? AND pushed_date <= ?
         """, (window_start.isoformat(), reference_date.isoformat()))
 
-        return {row[0] for row in cursor.fetchall()}
+        return frozenset(row[0] for row in cursor.fetchall())
+
+    def get_http_cache(self, url: str) -> Optional[dict]:
+        """Get the cached ETag/Last-Modified validators and body for a URL."""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT etag, last_modified, body FROM trending_cache WHERE url = ?",
+            (url,)
+        )
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+    def save_http_cache(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body: str
+    ) -> None:
+        """Store the latest validators and body for a URL."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO trending_cache (url, etag, last_modified, body)
+            VALUES (?, ?, ?, ?)
+        """, (url, etag, last_modified, body))
+
+    def get_cached_classifications(
+        self,
+        cache_keys: List[str],
+        max_age_days: int = 14
+    ) -> dict[str, dict]:
+        """Get unexpired LLM classification answers for the given cache keys."""
+        if not cache_keys:
+            return {}
+
+        max_age = f"-{int(max_age_days)} days"
+        cached = {}
+        for start in range(0, len(cache_keys), self.ID_LOOKUP_CHUNK):
+            chunk = cache_keys[start:start + self.ID_LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = self.conn.execute(f"""
+                SELECT cache_key, is_ai_related, reason
+                FROM classification_cache
+                WHERE cache_key IN ({placeholders})
+                  AND created_at > datetime('now', ?)
+            """, (*chunk, max_age))
+            cached.update(
+                (row[0], {"is_ai_related": bool(row[1]), "reason": row[2] or ""})
+                for row in cursor
+            )
+        return cached
+
+    def save_cached_classifications(self, entries: dict[str, dict]) -> None:
+        """Store LLM classification answers so later runs can skip the call."""
+        if not entries:
+            return
+
+        with self.transaction():
+            self.conn.executemany("""
+                INSERT OR REPLACE INTO classification_cache (cache_key, is_ai_related, reason)
+                VALUES (?, ?, ?)
+            """, [
+                (cache_key, int(bool(result.get("is_ai_related"))), str(result.get("reason") or ""))
+                for cache_key, result in entries.items()
+            ])
+
+    def get_cached_summary(self, cache_key: str) -> Optional[str]:
+        """Get a previously generated LLM summary by cache key."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT content FROM llm_summary_cache WHERE cache_key = ?", (cache_key,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def save_cached_summary(self, cache_key: str, content: str) -> None:
+        """Store a generated LLM summary so reruns on the same input can reuse it."""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT OR REPLACE INTO llm_summary_cache (cache_key, content)
+            VALUES (?, ?)
+        """, (cache_key, content))
 
     def close(self):
         """Close database connection"""
@@ -1,18 +1,109 @@
 """GitHub trending scraper module"""
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree, html
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Optional
 import logging
+import re
+import threading
 import time
 
 
 logger = logging.getLogger(__name__)
 
 
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_ARTICLE = f"article[{_has_class('Box-row')}]"
+_FIELD_PATHS = {
+    'link': f"h2[{_has_class('h3')}]//a",
+    'description': f"p[{_has_class('col-9')}]",
+    'language': "span[@itemprop='programmingLanguage']",
+    'growth': "span[normalize-space(@class)='d-inline-block float-sm-right']",
+}
+
+# Compiled once at import. The page-level expressions pull one field for every
+# article in a single pass; the article-level ones are the per-article fallback.
+_XP_ARTICLES = etree.XPath(f"//{_ARTICLE}")
+_XP_PAGE_FIELDS = {
+    name: etree.XPath(f"//{_ARTICLE}//{path}") for name, path in _FIELD_PATHS.items()
+}
+_XP_ARTICLE_FIELDS = {
+    name: etree.XPath(f"(.//{path})[1]") for name, path in _FIELD_PATHS.items()
+}
+_XP_STARGAZERS = etree.XPath("(.//a[@href=$href])[1]")
+_XP_STAR_ICON_PARENT = etree.XPath(f"(.//svg[{_has_class('octicon-star')}])[1]/..")
+
+_STARS_GROWTH_RE = re.compile(r'([\d,]+)\s*stars?')
+
+
+def _first(matches: list):
+    return matches[0] if matches else None
+
+
+def _parse_document(text: str):
+    """Parse HTML into an lxml tree; blank pages become an empty document."""
+    try:
+        return html.fromstring(text or "<html></html>")
+    except etree.ParserError:
+        return html.fromstring("<html></html>")
+
+
+def _collect_article_fields(tree, articles: list) -> list[dict]:
+    """Run each page-level field XPath once and hand every match to its owning article."""
+    owner_index = {article: idx for idx, article in enumerate(articles)}
+    fields = [{} for _ in articles]
+    for name, xpath in _XP_PAGE_FIELDS.items():
+        for element in xpath(tree):
+            idx = owner_index.get(next(element.iterancestors('article'), None))
+            if idx is not None:
+                # Document order, so the first match per article wins as in (.//x)[1].
+                fields[idx].setdefault(name, element)
+    return fields
+
+
+@lru_cache(maxsize=2048)
+def _parse_star_count(text: str) -> int:
+    """Star count from '1,234' or '1.2k'; the same counts recur across the three pages and runs."""
+    text = text.strip().replace(',', '')
+    if not text:
+        return 0
+
+    if text[-1] in 'kK':
+        # Handle '1.2k' format
+        return int(float(text[:-1]) * 1000)
+
+    try:
+        return int(text)
+    except ValueError:
+        return 0
+
+
+@lru_cache(maxsize=256)
+def _parse_star_growth(text: str) -> int:
+    """Stars growth from text like '123 stars today'"""
+    # Extract just the number part
+    match = _STARS_GROWTH_RE.search(text)
+    if match:
+        return _parse_star_count(match.group(1))
+    return 0
+
+
+def _stripped_text(element) -> str:
+    """Concatenate an element's text nodes, each stripped (same as get_text(strip=True))."""
+    return "".join(text.strip() for text in element.itertext())
+
+
 @dataclass
 class TrendingProject:
     """Trending project data"""
+    # Declared by hand (no field defaults, so dataclass allows it): ~75 rows per page
+    # across three pages, read field by field in every filter and formatter loop.
+    __slots__ = ('repo_name', 'description', 'language', 'url', 'stars', 'stars_growth', 'ranking')
+
     repo_name: str
     description: str
     language: str
@@ -27,19 +118,30 @@ class GitHubScraper:
 
     BASE_URL = "https://github.com/trending"
 
-    def __init__(self, github_token: Optional[str] = None, request_timeout: int = 60):
+    def __init__(
+        self,
+        github_token: Optional[str] = None,
+        request_timeout: int = 60,
+        http_cache=None,
+    ):
         """
         Initialize scraper
 
         Args:
             github_token: Optional GitHub token for API calls
             request_timeout: GitHub trending page request timeout in seconds
+            http_cache: Optional store with get_http_cache/save_http_cache (e.g. Database)
+                used for conditional GETs on unchanged trending pages
         """
         self.github_token = github_token
         self.request_timeout = max(5, int(request_timeout or 60))
+        self.http_cache = http_cache
+        # daily/weekly pages are fetched from worker threads; serialize cache access.
+        self._http_cache_lock = threading.Lock()
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            'Accept-Encoding': 'gzip, deflate',
         })
 
     def fetch_trending(self, since: str = "daily") -> List[TrendingProject]:
@@ -55,18 +157,17 @@ class GitHubScraper:
         url = f"{self.BASE_URL}?since={since}"
 
         try:
-            response = self.session.get(url, timeout=self.request_timeout)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'lxml')
+            page_text = self._get_page(url)
             projects = []
 
             # Find all repository articles
-            articles = soup.find_all('article', class_='Box-row')
+            tree = _parse_document(page_text)
+            articles = _XP_ARTICLES(tree)
+            article_fields = _collect_article_fields(tree, articles)
 
-            for idx, article in enumerate(articles, 1):
+            for idx, (article, fields) in enumerate(zip(articles, article_fields), 1):
                 try:
-                    project = self._parse_article(article, idx)
+                    project = self._parse_article(article, idx, fields)
                     if project:
                         projects.append(project)
                 except Exception as e:
@@ -80,53 +181,90 @@ class GitHubScraper:
             logger.error(f"Failed to fetch trending page: {e}")
             return []
 
-    def _parse_article(self, article: BeautifulSoup, ranking: int) -> Optional[TrendingProject]:
-        """Parse a single trending article"""
+    def _get_page(self, url: str) -> str:
+        """GET a trending page, reusing the cached body when GitHub answers 304."""
+        cached = None
+        if self.http_cache is not None:
+            with self._http_cache_lock:
+                cached = self.http_cache.get_http_cache(url)
+
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        if headers:
+            response = self.session.get(url, timeout=self.request_timeout, headers=headers)
+        else:
+            response = self.session.get(url, timeout=self.request_timeout)
 
-        # Extract repository name and URL
-        h2 = article.find('h2', class_='h3')
-        if not h2:
-            return None
+        if cached and response.status_code == 304:
+            logger.info(f"Trending page not modified, reusing cached copy: {url}")
+            return cached['body']
 
-        link = h2.find('a')
-        if not link:
+        response.raise_for_status()
+
+        if self.http_cache is not None:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                with self._http_cache_lock:
+                    self.http_cache.save_http_cache(url, etag, last_modified, response.text)
+
+        return response.text
+
+    def _parse_article(
+        self,
+        article: html.HtmlElement,
+        ranking: int,
+        fields: Optional[dict] = None,
+    ) -> Optional[TrendingProject]:
+        """Parse a single trending article, using pre-collected field elements when given"""
+        if fields is None:
+            fields = {name: _first(xpath(article)) for name, xpath in _XP_ARTICLE_FIELDS.items()}
+
+        # Extract repository name and URL
+        link = fields.get('link')
+        if link is None or link.get('href') is None:
             return None
 
-        repo_name = link['href'].strip('/')
-        url = f"https://github.com{link['href']}"
+        repo_name = link.get('href').strip('/')
+        url = f"https://github.com{link.get('href')}"
 
         # Extract description
-        description_elem = article.find('p', class_='col-9')
-        description = description_elem.get_text(strip=True) if description_elem else ""
+        description_elem = fields.get('description')
+        description = _stripped_text(description_elem) if description_elem is not None else ""
 
         # Extract language
-        language_elem = article.find('span', itemprop='programmingLanguage')
-        language = language_elem.get_text(strip=True) if language_elem else "Unknown"
+        language_elem = fields.get('language')
+        language = _stripped_text(language_elem) if language_elem is not None else "Unknown"
 
         # Extract stars and stars growth
         # Find the stargazers link which contains the total star count
         # The star button (which also has octicon-star) might appear first and contains "Star" text,
         # leading to 0 stars if we just grab the first octicon-star parent.
         stars = 0
-        stargazers_link = article.find('a', href=f"/{repo_name}/stargazers")
+        stargazers_link = _first(_XP_STARGAZERS(article, href=f"/{repo_name}/stargazers"))
 
-        if stargazers_link:
-            stars_text = stargazers_link.get_text(strip=True)
+        if stargazers_link is not None:
+            stars_text = _stripped_text(stargazers_link)
             stars = self._parse_stars(stars_text)
         else:
             # Fallback to looking for the icon if link not found (though less reliable)
-            stars_elem = article.find('svg', class_='octicon-star')
-            if stars_elem and stars_elem.parent:
-                stars_text = stars_elem.parent.get_text(strip=True)
+            stars_parent = _first(_XP_STAR_ICON_PARENT(article))
+            if stars_parent is not None:
+                stars_text = _stripped_text(stars_parent)
                 # Ensure we didn't pick up the "Star" button text
                 if "Star" not in stars_text:
                     stars = self._parse_stars(stars_text)
 
         # Extract stars growth
-        growth_elem = article.find('span', class_='d-inline-block float-sm-right')
+        growth_elem = fields.get('growth')
         stars_growth = 0
-        if growth_elem:
-            growth_text = growth_elem.get_text(strip=True)
+        if growth_elem is not None:
+            growth_text = _stripped_text(growth_elem)
             stars_growth = self._parse_stars_growth(growth_text)
 
         return TrendingProject(
@@ -141,23 +279,8 @@ class GitHubScraper:
 
     def _parse_stars(self, text: str) -> int:
         """Parse star count from text like '1,234' or '1.2k'"""
-        text = text.strip().replace(',', '')
-
-        if 'k' in text.lower():
-            # Handle '1.2k' format
-            num = float(text.lower().replace('k', ''))
-            return int(num * 1000)
-
-        try:
-            return int(text)
-        except ValueError:
-            return 0
+        return _parse_star_count(text)
 
     def _parse_stars_growth(self, text: str) -> int:
         """Parse stars growth from text like '123 stars today'"""
-        # Extract just the number part
-        import re
-        match = re.search(r'([\d,]+)\s*stars?', text)
-        if match:
-            return self._parse_stars(match.group(1))
-        return 0
+        return _parse_star_growth(text)
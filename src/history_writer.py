@@ -0,0 +1,10 @@
+"""Local markdown history files shared by the daily and weekly tasks."""
+import os
+from pathlib import Path
+
+
+def write_history_file(history_file: Path, content: str) -> None:
+    """Write a history report as pre-encoded bytes, replacing the old file atomically."""
+    tmp_file = history_file.with_name(history_file.name + ".tmp")
+    tmp_file.write_bytes(content.encode("utf-8"))
+    os.replace(tmp_file, history_file)
@@ -0,0 +1,51 @@
+"""Queue-backed logging shared by the daily and weekly tasks."""
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+
+_LOG_LISTENER: QueueListener | None = None
+
+
+def start_queue_logging(log_file: str, log_level: str) -> None:
+    """Route log records through a queue to file/console handlers on a listener thread."""
+    global _LOG_LISTENER
+
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+
+    # File/console writes happen on a listener thread so logging from the
+    # concurrent LLM/fetch workers never blocks on disk I/O.
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    output_handlers = [
+        logging.FileHandler(log_file, encoding='utf-8'),
+        logging.StreamHandler()
+    ]
+    for handler in output_handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
+    stop_logging()
+    _LOG_LISTENER = QueueListener(log_queue, *output_handlers, respect_handler_level=True)
+    _LOG_LISTENER.start()
+
+    # force=True swaps out a previous run's queue handler instead of silently keeping it.
+    logging.basicConfig(
+        level=log_level,
+        handlers=[queue_handler],
+        force=True
+    )
+
+
+def stop_logging() -> None:
+    """Flush queued log records, stop the background log listener and close its handlers."""
+    global _LOG_LISTENER
+    if _LOG_LISTENER is not None:
+        _LOG_LISTENER.stop()
+        # stop() only drains the queue; close the file handler so a reconfiguration
+        # does not leak the previous log file's descriptor.
+        for handler in _LOG_LISTENER.handlers:
+            handler.close()
+        _LOG_LISTENER = None
@@ -0,0 +1,72 @@
+"""Client-side request/token pacing for LLM calls."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket over requests-per-minute and tokens-per-minute.
+
+    Each bucket starts full (one minute of budget) and refills continuously,
+    so callers block just long enough to stay under the provider's caps
+    instead of bursting into 429s.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._capacity: dict[str, float] = {}
+        if requests_per_minute:
+            self._capacity["requests"] = float(requests_per_minute)
+        if tokens_per_minute:
+            self._capacity["tokens"] = float(tokens_per_minute)
+        self._levels = dict(self._capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def is_enabled(self) -> bool:
+        return bool(self._capacity)
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until one request and ``tokens`` tokens fit in the budget, then spend them."""
+        if not self._capacity:
+            return
+
+        needed = {"requests": 1.0, "tokens": float(max(0, tokens))}
+        needed = {name: min(needed[name], capacity) for name, capacity in self._capacity.items()}
+
+        while True:
+            with self._lock:
+                self._refill()
+                wait = max(
+                    (needed[name] - self._levels[name]) * 60.0 / self._capacity[name]
+                    for name in self._capacity
+                )
+                if wait <= 0:
+                    for name in self._capacity:
+                        self._levels[name] -= needed[name]
+                    return
+            self._sleep(wait)
+
+    def acquire_for_prompt(self, prompt: str, completion_tokens: int) -> None:
+        """Reserve one call sized as ~3 chars per prompt token plus the expected completion."""
+        if self._capacity:
+            self.acquire(tokens=len(prompt) // 3 + completion_tokens)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated_at)
+        self._updated_at = now
+        for name, capacity in self._capacity.items():
+            self._levels[name] = min(capacity, self._levels[name] + elapsed * capacity / 60.0)
@@ -4,6 +4,9 @@ from __future__ import annotations
 
 import importlib.util
 import os
+import random
+import re
+import threading
 from pathlib import Path
 from types import ModuleType
 
@@ -18,6 +21,16 @@ DEFAULT_MODEL = "gpt-5.4"
 DEFAULT_REASONING_EFFORT = "xhigh"
 
 _SHARED_LLM_MODULE: ModuleType | None = None
+_SHARED_LLM_MODULE_LOCK = threading.Lock()
+
+_RETRY_AFTER_PATTERN = re.compile(r"retry[-_ ]after\D{0,3}(\d+(?:\.\d+)?)", re.I)
+# Status codes only on word boundaries and specific timeout phrases, so permanent
+# errors like "400 - max_tokens must be <= 4500" or "invalid value for timeout" fail fast.
+_TRANSIENT_ERROR_PATTERN = re.compile(
+    r"\b(?:429|5\d\d)\b|rate limit|too many requests|timed out|(?:read|connect) timeout"
+    r"|overloaded|connection reset|connection aborted",
+    re.I,
+)
 
 
 def _resolve_shared_llm_client_path() -> Path:
@@ -30,14 +43,20 @@ def _load_shared_llm_module() -> ModuleType:
     if _SHARED_LLM_MODULE is not None:
         return _SHARED_LLM_MODULE
 
-    client_path = _resolve_shared_llm_client_path()
-    spec = importlib.util.spec_from_file_location("shared_stock_llm_client", client_path)
-    if spec is None or spec.loader is None:
-        raise RuntimeError(f"Unable to load shared llm client from {client_path}")
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    _SHARED_LLM_MODULE = module
-    return module
+    # Concurrent callers (batch_filter fan-out) must share one module instance,
+    # and with it the shared client's pooled HTTP connections.
+    with _SHARED_LLM_MODULE_LOCK:
+        if _SHARED_LLM_MODULE is not None:
+            return _SHARED_LLM_MODULE
+
+        client_path = _resolve_shared_llm_client_path()
+        spec = importlib.util.spec_from_file_location("shared_stock_llm_client", client_path)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"Unable to load shared llm client from {client_path}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _SHARED_LLM_MODULE = module
+        return module
 
 
 def call_shared_llm(
@@ -65,3 +84,31 @@ def call_shared_llm(
     if result is None:
         raise RuntimeError("All LLM fallbacks failed (GMN + OpenRouter #1 + OpenRouter #2)")
     return result
+
+
+def is_transient_llm_error(error: Exception) -> bool:
+    """True for throttling (429), timeout, connection or 5xx failures worth retrying."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return _TRANSIENT_ERROR_PATTERN.search(str(error)) is not None
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Server-suggested wait parsed from a Retry-After hint in the error, if any."""
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        try:
+            return float(retry_after)
+        except (TypeError, ValueError):
+            pass
+    match = _RETRY_AFTER_PATTERN.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+def llm_retry_delay(attempt: int, error: Exception, max_delay: float) -> float:
+    """Retry-After if given, else 1s, 2s, 4s... (capped at max_delay) with +/-25% jitter."""
+    retry_after = retry_after_seconds(error)
+    if retry_after is not None:
+        return min(max_delay, max(0.0, retry_after))
+    base = min(max_delay, 2 ** (attempt - 1))
+    return base * (0.75 + random.random() * 0.5)
@@ -1,21 +1,46 @@
 """WeCom (Enterprise WeChat) notifier module"""
+from __future__ import annotations
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import io
+import json
 import logging
+import re
 import time
-from typing import List
+from itertools import islice
+from typing import TYPE_CHECKING, List
 from datetime import date
-from src.github_scraper import TrendingProject
-from src.ai_filter import FilterResult, ProjectAnalysis
+
+from src.ai_highlight import normalize_ai_highlight
+
+if TYPE_CHECKING:
+    # Annotation-only: importing these at runtime would load lxml and the LLM
+    # filter stack into weekly.py, which never scrapes or classifies.
+    from src.github_scraper import TrendingProject
+    from src.ai_filter import FilterResult, ProjectAnalysis
 
 
 logger = logging.getLogger(__name__)
 
+_ERRCODE_OK_PATTERN = re.compile(rb'\s*\{\s*"errcode"\s*:\s*0\s*[,}]')
+# The body is sent pre-encoded (see _encode_payload), so the charset must be explicit.
+_JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+_RANK_EMOJIS = ("1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟")
+
 
 class WeComNotifier:
     """WeCom webhook notifier"""
     PUSH_MARKDOWN_LIMIT = 3800
     RETRY_SHRINK_LIMIT = 2500
     SUMMARY_CONTENT_LIMIT = 2600
+    DAILY_MESSAGE_CACHE_SIZE = 4
+    SPLIT_SEND_INTERVAL = 1.0
+    # (connect, read): an unreachable webhook fails fast, a slow accept still gets 10s.
+    REQUEST_TIMEOUT = (3, 10)
+    SUMMARY_TITLE = "📝 **AI智能总结 & 业务价值分析**"
+    FOOTER = "\n---\n⏰ 由GitHub-Trend-Bot自动推送"
     PUSH_TEXT_TRUNCATION_PROFILES = (
         (None, None),
         (240, 260),
@@ -32,6 +57,35 @@ class WeComNotifier:
             webhook_url: WeCom webhook URL
         """
         self.webhook_url = webhook_url
+        self._daily_message_cache: dict[tuple, str] = {}
+        self._last_sent_at: float | None = None
+        # One keep-alive session for all pushes of a run (split reports send several
+        # messages). Transport-level retries only cover failed connects and 429/503,
+        # where WeCom has not accepted the message; read errors/timeouts are never
+        # retried (read=0) because the push may already be stored, so a retry cannot
+        # double-post.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=2,
+            max_retries=Retry(
+                total=3,
+                connect=3,
+                read=0,
+                status=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 503),
+                allowed_methods=frozenset({'POST'}),
+                raise_on_status=False,
+            ),
+        )
+        # Self-hosted relays may expose the webhook over plain HTTP; pool those too.
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def close(self) -> None:
+        """Release pooled webhook connections"""
+        self.session.close()
 
     def send_markdown(self, content: str) -> bool:
         """
@@ -77,14 +131,41 @@ class WeComNotifier:
         }
 
         try:
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
+            response = self.session.post(
+                self.webhook_url,
+                data=self._encode_payload(payload),
+                headers=_JSON_HEADERS,
+                timeout=self.REQUEST_TIMEOUT,
+            )
+            self._last_sent_at = time.monotonic()
             response.raise_for_status()
+            # The usual success body is a tiny fixed object; only decode JSON when it is not.
+            if _ERRCODE_OK_PATTERN.match(response.content):
+                return True, {"errcode": 0}
             result = response.json()
             return result.get('errcode') == 0, result
         except requests.RequestException as e:
             logger.error(f"Failed to send WeCom message: {e}")
             return False, None
 
+    @staticmethod
+    def _encode_payload(payload: dict) -> bytes:
+        """
+        Compact UTF-8 JSON body.
+
+        requests' ``json=`` escapes every CJK character as a 6-byte \\uXXXX sequence;
+        raw UTF-8 is 3 bytes, roughly halving the body of a Chinese report.
+        """
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _wait_for_send_interval(self) -> None:
+        """Keep back-to-back pushes at least SPLIT_SEND_INTERVAL apart (bot webhook rate limit)."""
+        if self._last_sent_at is None:
+            return
+        delay = self.SPLIT_SEND_INTERVAL - (time.monotonic() - self._last_sent_at)
+        if delay > 0:
+            time.sleep(delay)
+
     def format_daily_report(
         self,
         projects_with_reasons: List[tuple[TrendingProject, FilterResult]],
@@ -156,12 +237,14 @@ class WeComNotifier:
             summary,
             analysis_map=analysis_map,
         )
+        return self.send_prepared(trend_message, summary_message)
 
+    def send_prepared(self, trend_message: str, summary_message: str) -> bool:
+        """Send an already formatted trend/summary message pair, paced like the split reports."""
         if not self.send_markdown(trend_message):
             return False
 
-        # Avoid hitting bot webhook rate limits with immediate back-to-back calls.
-        time.sleep(1)
+        self._wait_for_send_interval()
         return self.send_markdown(summary_message)
 
     def format_weekly_push_messages(
@@ -190,13 +273,7 @@ class WeComNotifier:
             week_end,
             summary
         )
-
-        if not self.send_markdown(trend_message):
-            return False
-
-        # Avoid hitting bot webhook rate limits with immediate back-to-back calls.
-        time.sleep(1)
-        return self.send_markdown(summary_message)
+        return self.send_prepared(trend_message, summary_message)
 
     def _format_daily_top_message(
         self,
@@ -207,10 +284,11 @@ class WeComNotifier:
     ) -> str:
         """Format top projects message in markdown."""
         if for_push:
-            message = self._format_push_top_message(
+            # Already within PUSH_MARKDOWN_LIMIT: either rendered under the running byte
+            # budget or passed through _fit_markdown_limit, so it is not re-encoded here.
+            return self._format_push_top_message(
                 projects_with_reasons, report_date, analysis_map=analysis_map
             )
-            return self._fit_markdown_limit(message)
         return self._format_local_top_message(
             projects_with_reasons, report_date, analysis_map=analysis_map
         )
@@ -222,43 +300,41 @@ class WeComNotifier:
         analysis_map: dict[str, ProjectAnalysis] | None = None,
     ) -> str:
         """Render richer push cards and only shorten when the whole message needs it."""
-        last_message = ""
-        for description_max, highlight_max in self.PUSH_TEXT_TRUNCATION_PROFILES:
+        # Card texts do not depend on the truncation profile, so derive them once.
+        card_texts = self._build_push_card_texts(projects_with_reasons, analysis_map)
+        *budgeted_profiles, (last_description_max, last_highlight_max) = self.PUSH_TEXT_TRUNCATION_PROFILES
+        for description_max, highlight_max in budgeted_profiles:
+            # Rendering stops as soon as this profile overflows, so rejected attempts stay cheap.
             message = self._render_push_top_message(
                 projects_with_reasons,
                 report_date,
                 description_max=description_max,
                 highlight_max=highlight_max,
                 analysis_map=analysis_map,
+                card_texts=card_texts,
+                byte_budget=self.PUSH_MARKDOWN_LIMIT,
             )
-            if len(message.encode("utf-8")) <= self.PUSH_MARKDOWN_LIMIT:
+            if message is not None:
                 return message
-            last_message = message
-        return self._fit_markdown_limit(last_message)
 
-    def _render_push_top_message(
+        message = self._render_push_top_message(
+            projects_with_reasons,
+            report_date,
+            description_max=last_description_max,
+            highlight_max=last_highlight_max,
+            analysis_map=analysis_map,
+            card_texts=card_texts,
+        )
+        return self._fit_markdown_limit(message)
+
+    def _build_push_card_texts(
         self,
         projects_with_reasons: List[tuple[TrendingProject, FilterResult]],
-        report_date: date,
-        description_max: int | None = None,
-        highlight_max: int | None = None,
         analysis_map: dict[str, ProjectAnalysis] | None = None,
-    ) -> str:
-        """Build a WeCom-friendly project list with optional adaptive shortening."""
-        limit = len(projects_with_reasons)
-        lines = [
-            f"🔥 **今日GitHub AI趋势 Top {limit}**",
-            f"📅 {report_date.strftime('%Y-%m-%d')}",
-            ""
-        ]
-
-        emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣", "🔟"]
-
-        for idx, (project, result) in enumerate(projects_with_reasons):
-            emoji = emojis[idx] if idx < len(emojis) else f"{idx+1}."
-            stars_str = f"{project.stars:,}"
-            growth_str = f"{project.stars_growth:+,}"
-
+    ) -> List[tuple[str, str]]:
+        """Untruncated (description, highlight) per push card."""
+        card_texts = []
+        for project, result in projects_with_reasons:
             # Use LLM-generated features if available, otherwise fall back
             analysis = (analysis_map or {}).get(project.repo_name)
             if analysis and analysis.features:
@@ -270,25 +346,64 @@ class WeComNotifier:
                 highlight = analysis.advantages
             else:
                 highlight = self._normalize_ai_highlight(result.reason, project.description)
+            card_texts.append((description, highlight))
+        return card_texts
+
+    def _render_push_top_message(
+        self,
+        projects_with_reasons: List[tuple[TrendingProject, FilterResult]],
+        report_date: date,
+        description_max: int | None = None,
+        highlight_max: int | None = None,
+        analysis_map: dict[str, ProjectAnalysis] | None = None,
+        card_texts: List[tuple[str, str]] | None = None,
+        byte_budget: int | None = None,
+    ) -> str | None:
+        """Build a WeCom-friendly project list with optional adaptive shortening.
 
-            if description_max is not None:
-                description = self._truncate_text(description, description_max)
-            if highlight_max is not None:
-                highlight = self._truncate_text(highlight, highlight_max)
+        With ``byte_budget`` set, returns None once the UTF-8 size would exceed it.
+        """
+        if card_texts is None:
+            card_texts = self._build_push_card_texts(projects_with_reasons, analysis_map)
+        limit = len(projects_with_reasons)
+        header = f"🔥 **今日GitHub AI趋势 Top {limit}**\n📅 {report_date.isoformat()}\n\n"
+        footer = self.FOOTER[1:]  # the preceding card already ends with a newline
+        remaining = None
+        if byte_budget is not None:
+            remaining = byte_budget - self._utf8_length(header) - self._utf8_length(footer)
+            if remaining < 0:
+                return None
+        buf = io.StringIO()
+        buf.write(header)
+
+        for idx, ((project, _result), (description, highlight)) in enumerate(
+            zip(projects_with_reasons, card_texts)
+        ):
+            emoji = _RANK_EMOJIS[idx] if idx < len(_RANK_EMOJIS) else f"{idx+1}."
+            stars_str = f"{project.stars:,}"
+            growth_str = f"{project.stars_growth:+,}"
 
-            lines.extend([
-                f"{emoji} **{project.repo_name}**｜{project.language or 'Unknown'}｜⭐ {stars_str}｜{growth_str}",
-                f"- 📝 {description}",
-                f"- 💡 {highlight}",
-                f"- 🔗 {project.url}",
-                ""
-            ])
+            # Inlined _truncate_text: this loop runs per card for every truncation profile.
+            if description_max is not None and len(description) > description_max:
+                description = description[:description_max] + "..."
+            if highlight_max is not None and len(highlight) > highlight_max:
+                highlight = highlight[:highlight_max] + "..."
+
+            # One write per card; the trailing blank line separates cards.
+            card = (
+                f"{emoji} **{project.repo_name}**｜{project.language or 'Unknown'}｜⭐ {stars_str}｜{growth_str}\n"
+                f"- 📝 {description}\n"
+                f"- 💡 {highlight}\n"
+                f"- 🔗 {project.url}\n\n"
+            )
+            if remaining is not None:
+                remaining -= self._utf8_length(card)
+                if remaining < 0:
+                    return None
+            buf.write(card)
 
-        lines.extend([
-            "---",
-            "⏰ 由GitHub-Trend-Bot自动推送"
-        ])
-        return "\n".join(lines)
+        buf.write(footer)
+        return buf.getvalue()
 
     def _format_local_top_message(
         self,
@@ -297,11 +412,23 @@ class WeComNotifier:
         analysis_map: dict[str, ProjectAnalysis] | None = None,
     ) -> str:
         """Readable local markdown report for Feishu file delivery."""
+        fragment = self._build_local_top_fragment(
+            projects_with_reasons, report_date, analysis_map=analysis_map
+        )
+        return fragment + self.FOOTER
+
+    def _build_local_top_fragment(
+        self,
+        projects_with_reasons: List[tuple[TrendingProject, FilterResult]],
+        report_date: date,
+        analysis_map: dict[str, ProjectAnalysis] | None = None,
+    ) -> str:
+        """Local top-project cards without the bot footer."""
         limit = len(projects_with_reasons)
         lines = [
             f"# GitHub AI 趋势 Top {limit}",
             "",
-            f"- 日期：{report_date.strftime('%Y-%m-%d')}",
+            f"- 日期：{report_date.isoformat()}",
             f"- 样本：当日筛选后的 Top {limit} AI 项目",
             "",
             "## 项目卡片",
@@ -346,25 +473,11 @@ class WeComNotifier:
                 ""
             ])
 
-        lines.extend([
-            "---",
-            "⏰ 由GitHub-Trend-Bot自动推送"
-        ])
         return "\n".join(lines)
 
     def _format_daily_summary_message(self, report_date: date, summary: str, for_push: bool = True) -> str:
         """Format summary/business analysis message in markdown."""
-        summary_content = self._prepare_summary_content(summary, for_push=for_push)
-
-        lines = [
-            "📝 **AI智能总结 & 业务价值分析**",
-            f"\n📅 {report_date.strftime('%Y-%m-%d')}",
-            "\n---\n",
-            summary_content,
-            "\n---\n⏰ 由GitHub-Trend-Bot自动推送"
-        ]
-        message = "\n".join(lines)
-        return self._fit_markdown_limit(message) if for_push else message
+        return self._format_summary_message(report_date.isoformat(), summary, for_push)
 
     def _format_weekly_summary_message(
         self,
@@ -374,16 +487,14 @@ class WeComNotifier:
         for_push: bool = True
     ) -> str:
         """Format weekly summary/business analysis message in markdown."""
-        summary_content = self._prepare_summary_content(summary, for_push=for_push)
+        return self._format_summary_message(
+            f"{week_start.isoformat()} ~ {week_end.isoformat()}", summary, for_push
+        )
 
-        lines = [
-            "📝 **AI智能总结 & 业务价值分析**",
-            f"\n📅 {week_start.strftime('%Y-%m-%d')} ~ {week_end.strftime('%Y-%m-%d')}",
-            "\n---\n",
-            summary_content,
-            "\n---\n⏰ 由GitHub-Trend-Bot自动推送"
-        ]
-        message = "\n".join(lines)
+    def _format_summary_message(self, period: str, summary: str, for_push: bool) -> str:
+        """Shared daily/weekly summary layout: fixed title, period line, content, footer."""
+        summary_content = self._prepare_summary_content(summary, for_push=for_push)
+        message = f"{self.SUMMARY_TITLE}\n\n📅 {period}\n\n---\n\n{summary_content}\n{self.FOOTER}"
         return self._fit_markdown_limit(message) if for_push else message
 
     def _prepare_summary_content(self, summary: str, for_push: bool = True) -> str:
@@ -392,54 +503,34 @@ class WeComNotifier:
         if not for_push:
             return content
 
-        if len(content.encode("utf-8")) <= self.SUMMARY_CONTENT_LIMIT:
+        encoded = content.encode("utf-8")
+        if len(encoded) <= self.SUMMARY_CONTENT_LIMIT:
             return content
 
         suffix = "\n\n（总结较长，已自动精简）"
         suffix_bytes = len(suffix.encode("utf-8"))
         allowed = self.SUMMARY_CONTENT_LIMIT - suffix_bytes
         if allowed <= 0:
-            return self._truncate_by_bytes(content, self.SUMMARY_CONTENT_LIMIT)
-        return self._truncate_by_bytes(content, allowed) + suffix
+            return self._truncate_encoded(encoded, self.SUMMARY_CONTENT_LIMIT)
+        return self._truncate_encoded(encoded, allowed) + suffix
 
     def _shrink_for_retry(self, content: str) -> str:
         """Shrink markdown for one retry attempt after API rejection."""
-        content_bytes = len(content.encode("utf-8"))
-        if content_bytes <= self.RETRY_SHRINK_LIMIT:
+        encoded = content.encode("utf-8")
+        if len(encoded) <= self.RETRY_SHRINK_LIMIT:
             return content
 
         suffix = "\n\n（首次推送失败，已自动精简重发）"
         suffix_bytes = len(suffix.encode("utf-8"))
         allowed = self.RETRY_SHRINK_LIMIT - suffix_bytes
         if allowed <= 0:
-            return self._truncate_by_bytes(content, self.RETRY_SHRINK_LIMIT)
-        return self._truncate_by_bytes(content, allowed) + suffix
+            return self._truncate_encoded(encoded, self.RETRY_SHRINK_LIMIT)
+        return self._truncate_encoded(encoded, allowed) + suffix
 
     @staticmethod
     def _normalize_ai_highlight(reason: str, description: str = "") -> str:
         """Rewrite unreadable fallback reasons into a user-facing Chinese highlight."""
-        normalized = (reason or "").strip()
-        lower_reason = normalized.lower()
-
-        fallback_markers = (
-            "keyword-based detection",
-            "keyword based detection",
-            "llm unavailable"
-        )
-        if not normalized or any(marker in lower_reason for marker in fallback_markers):
-            desc_text = (description or "").lower()
-            if any(kw in desc_text for kw in ("agent", "assistant", "copilot", "workflow")):
-                area = "AI Agent/智能助手方向"
-            elif any(kw in desc_text for kw in ("llm", "gpt", "chat", "rag", "prompt")):
-                area = "LLM 应用方向"
-            elif any(kw in desc_text for kw in ("vision", "image", "video", "multimodal")):
-                area = "多模态/视觉方向"
-            else:
-                area = "AI 应用或工具方向"
-
-            return f"基于项目描述中的关键词判定，该项目与 {area}相关，建议后续结合 README 做进一步复核。"
-
-        return normalized
+        return normalize_ai_highlight(reason, description)
 
     @classmethod
     def _build_project_brief(
@@ -649,27 +740,90 @@ class WeComNotifier:
         analysis_map: dict[str, ProjectAnalysis] | None = None,
     ) -> str:
         """Format daily message in markdown"""
-        top_message = self._format_daily_top_message(
+        # History rendering and send_daily_report can format the same day twice; reuse it.
+        key = self._daily_message_key(
             projects_with_reasons,
             report_date,
-            for_push=False,
+            summary,
+            weekly_references,
+            monthly_references,
+            analysis_map,
+        )
+        cached = self._daily_message_cache.get(key)
+        if cached is not None:
+            return cached
+
+        message = self._build_daily_message(
+            projects_with_reasons,
+            report_date,
+            summary,
+            weekly_references=weekly_references,
+            monthly_references=monthly_references,
             analysis_map=analysis_map,
         )
-        summary_message = self._format_daily_summary_message(
+        if len(self._daily_message_cache) >= self.DAILY_MESSAGE_CACHE_SIZE:
+            self._daily_message_cache.pop(next(iter(self._daily_message_cache)))
+        self._daily_message_cache[key] = message
+        return message
+
+    @staticmethod
+    def _daily_message_key(
+        projects_with_reasons: List[tuple[TrendingProject, FilterResult]],
+        report_date: date,
+        summary: str,
+        weekly_references: List[tuple[TrendingProject, FilterResult]] | None,
+        monthly_references: List[tuple[TrendingProject, FilterResult]] | None,
+        analysis_map: dict[str, ProjectAnalysis] | None,
+    ) -> tuple:
+        """Value key over every input the daily markdown depends on."""
+        def entries(pairs):
+            return tuple(
+                (
+                    project.repo_name,
+                    project.description,
+                    project.language,
+                    project.url,
+                    project.stars,
+                    project.stars_growth,
+                    result.reason,
+                )
+                for project, result in pairs or ()
+            )
+
+        analyses = tuple(
+            (repo_name, analysis.features, analysis.advantages,
+             analysis.disadvantages, analysis.recommendation)
+            for repo_name, analysis in sorted((analysis_map or {}).items())
+        )
+        return (
             report_date,
             summary,
-            for_push=False
+            entries(projects_with_reasons),
+            entries(weekly_references),
+            entries(monthly_references),
+            analyses,
         )
 
-        # Keep history output as one markdown document.
-        top_without_footer = top_message.rsplit("\n---\n⏰ 由GitHub-Trend-Bot自动推送", 1)[0]
-        summary_body = summary_message.split("\n---\n", 1)[-1]
-        summary_without_footer = summary_body.rsplit("\n---\n⏰ 由GitHub-Trend-Bot自动推送", 1)[0]
+    def _build_daily_message(
+        self,
+        projects_with_reasons: List[tuple[TrendingProject, FilterResult]],
+        report_date: date,
+        summary: str = "",
+        weekly_references: List[tuple[TrendingProject, FilterResult]] | None = None,
+        monthly_references: List[tuple[TrendingProject, FilterResult]] | None = None,
+        analysis_map: dict[str, ProjectAnalysis] | None = None,
+    ) -> str:
+        """Render the full local daily markdown document."""
+        # Keep history output as one markdown document built from footer-less fragments.
+        top_fragment = self._build_local_top_fragment(
+            projects_with_reasons, report_date, analysis_map=analysis_map
+        )
+        summary_content = self._prepare_summary_content(summary, for_push=False)
 
         lines = [
-            top_without_footer,
+            top_fragment,
             "\n---\n",
-            summary_without_footer,
+            f"\n{summary_content}\n",
         ]
 
         weekly_section = self._format_reference_section("周榜参考", weekly_references or [])
@@ -683,7 +837,7 @@ class WeComNotifier:
                     lines.append("")
                 lines.append(monthly_section)
 
-        lines.append("\n---\n⏰ 由GitHub-Trend-Bot自动推送")
+        lines.append(self.FOOTER)
         return "\n".join(lines)
 
     def _format_reference_section(
@@ -697,7 +851,8 @@ class WeComNotifier:
             return ""
 
         lines = [f"## {title}", ""]
-        for idx, (project, result) in enumerate(projects_with_reasons[:limit], start=1):
+        # The weekly/monthly lists run to a few dozen rows; walk only the first ``limit``.
+        for idx, (project, result) in enumerate(islice(projects_with_reasons, limit), start=1):
             detail = self._build_local_project_detail(
                 project,
                 self._normalize_ai_highlight(result.reason, project.description)
@@ -714,7 +869,9 @@ class WeComNotifier:
 
     def _fit_markdown_limit(self, content: str) -> str:
         """Ensure markdown content stays within WeCom message UTF-8 byte limit."""
-        if len(content.encode("utf-8")) <= self.PUSH_MARKDOWN_LIMIT:
+        # ASCII text has one byte per character, so it can be measured and sliced without encoding.
+        encoded = None if content.isascii() else content.encode("utf-8")
+        if len(content if encoded is None else encoded) <= self.PUSH_MARKDOWN_LIMIT:
             return content
 
         suffix = "\n\n（内容过长，已截断）"
@@ -723,25 +880,35 @@ class WeComNotifier:
             return self._truncate_by_bytes(suffix, self.PUSH_MARKDOWN_LIMIT)
 
         allowed_bytes = self.PUSH_MARKDOWN_LIMIT - suffix_bytes
-        return self._truncate_by_bytes(content, allowed_bytes) + suffix
+        if encoded is None:
+            return content[:allowed_bytes] + suffix
+        return self._truncate_encoded(encoded, allowed_bytes) + suffix
+
+    @staticmethod
+    def _utf8_length(text: str) -> int:
+        """UTF-8 byte length, without encoding ASCII text."""
+        return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+    @staticmethod
+    def _truncate_encoded(encoded: bytes, max_bytes: int) -> str:
+        """Cut already-encoded UTF-8 at a character boundary at or below max_bytes."""
+        if max_bytes <= 0:
+            return ""
+        # The input is valid UTF-8, so "ignore" can only drop the character the slice
+        # cut through at the end; the decoder does the boundary search in C.
+        return encoded[:max_bytes].decode("utf-8", "ignore")
 
     @staticmethod
     def _truncate_by_bytes(text: str, max_bytes: int) -> str:
         """Truncate text by UTF-8 bytes without breaking characters."""
         if max_bytes <= 0:
             return ""
-        if len(text.encode("utf-8")) <= max_bytes:
+        if text.isascii():
+            return text[:max_bytes]
+        encoded = text.encode("utf-8")
+        if len(encoded) <= max_bytes:
             return text
-
-        left = 0
-        right = len(text)
-        while left < right:
-            mid = (left + right + 1) // 2
-            if len(text[:mid].encode("utf-8")) <= max_bytes:
-                left = mid
-            else:
-                right = mid - 1
-        return text[:left]
+        return WeComNotifier._truncate_encoded(encoded, max_bytes)
 
     @staticmethod
     def _truncate_text(text: str, max_length: int) -> str:
@@ -1,21 +1,80 @@
 """Weekly report generator"""
+import hashlib
+import json
 import logging
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from src.ai_highlight import lowest_matching_group, normalize_ai_highlight
 from src.database import Database
-from src.shared_llm import call_shared_llm
+from src.rate_limiter import TokenBucketRateLimiter
+from src.shared_llm import call_shared_llm, is_transient_llm_error, llm_retry_delay
+from src.wecom_notifier import WeComNotifier
 
 
 logger = logging.getLogger(__name__)
+
+# One alternation per category, in priority order; group N maps to _CATEGORY_NAMES[N - 1].
+# Wrapped in a zero-width lookahead so overlapping keywords ("tool" in "toollm") are all seen.
+_CATEGORY_PATTERN = re.compile(
+    r"(?=(llm|nlp|language|gpt|chatbot|embedding)"
+    r"|(vision|image|video|opencv|detection)"
+    r"|(framework|tool|library|platform)"
+    r"|(multimodal|multi-modal|audio|speech))",
+    re.IGNORECASE,
+)
+_CATEGORY_NAMES = ('LLM/NLP', '计算机视觉', 'AI工具/框架', '多模态应用')
+# Also the display order of the category statistics.
+_CATEGORY_EMOJIS = {
+    'LLM/NLP': '🤖',
+    '计算机视觉': '👁',
+    'AI工具/框架': '🛠',
+    '多模态应用': '🎨',
+    '其他': '📦'
+}
+
+
 class WeeklyReporter:
     """Generate weekly AI trends report"""
 
+    LLM_RETRY_MAX_ATTEMPTS = 3
+    LLM_RETRY_BACKOFF_MAX = 30.0
+    # Rough completion size reserved against the TPM budget before each call.
+    COMPLETION_TOKENS = 2048
+    TRENDS_MARKER = "===TRENDS==="
+    SUMMARY_MARKER = "===SUMMARY==="
+    COMBINED_SYSTEM_PROMPT = "你是资深AI技术战略分析师，擅长技术趋势分析和业务价值评估。"
+    # Fixed instructions first, project list last, so the prompt prefix stays stable week to week.
+    COMBINED_PROMPT_PREFIX = f"""请分析文末的本周GitHub热门AI项目列表，一次性输出两部分内容，并严格使用下面两个分隔符（各占一行）：
+
+{TRENDS_MARKER}
+总结技术趋势和热点方向（2-3条要点，每条1句话）。
+
+{SUMMARY_MARKER}
+1. 给出“本周趋势总结”（一段话，聚焦核心技术方向和变化）。
+2. 评估这些项目对搜狐业务的价值，重点覆盖搜索引擎、推荐系统、AI基础设施（训练/推理/部署）。
+   - 仅在确实相关时给出项目与收益说明，不要编造。
+
+第二部分输出要求：
+- 使用 Markdown。
+- 必须包含标题“## 本周趋势总结”。
+- 必须包含标题“🚀 **搜狐业务价值分析**”。
+
+本周项目列表：
+"""
+
     def __init__(
         self,
         database: Database,
         ai_base_url: str,
         ai_api_key: str,
-        ai_model: str
+        ai_model: str,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
     ):
         """
         Initialize weekly reporter
@@ -25,11 +84,15 @@ class WeeklyReporter:
             ai_base_url: LLM API base URL
             ai_api_key: LLM API key
             ai_model: LLM model name
+            requests_per_minute: Client-side RPM cap for LLM calls (None = unlimited)
+            tokens_per_minute: Client-side TPM cap for LLM calls (None = unlimited)
+            rate_limiter: Limiter shared with other LLM clients on the same key; overrides the RPM/TPM caps
         """
         self.db = database
         self.ai_base_url = (ai_base_url or "").strip()
         self.ai_api_key = (ai_api_key or "").strip()
         self.model = ai_model
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter(requests_per_minute, tokens_per_minute)
 
     def generate_report(
         self,
@@ -65,24 +128,38 @@ class WeeklyReporter:
             - report: Top projects + trend analysis
             - summary: AI summary and business value analysis content
         """
-        # Fetch weekly trends
-        trends = self.db.get_weekly_trends(week_start, week_end)
+        # Deduplicated (highest stars per project) top projects, selected in SQLite
+        top_projects = self.db.get_weekly_top_projects(week_start, week_end, max_projects)
 
-        if not trends:
+        if not top_projects:
             return {
                 "report": self._format_empty_report(week_start, week_end),
                 "summary": self._format_empty_summary()
             }
 
-        # Deduplicate (keep highest stars for each project)
-        unique_projects = self._deduplicate_projects(trends)
-
-        # Limit to max_projects
-        top_projects = unique_projects[:max_projects]
-
-        # Generate LLM analysis
-        tech_trends = self._analyze_trends(top_projects)
-        weekly_summary = self._analyze_weekly_summary(top_projects, tech_trends)
+        # Reruns on the same week and Top list (dry-run, then real push) skip the LLM.
+        cache_key = self.analysis_cache_key(week_start, week_end, top_projects)
+        combined = self._load_cached_analysis(cache_key)
+        if combined is None:
+            # One request for both sections; fall back to the two dedicated prompts.
+            combined = self._analyze_combined(top_projects)
+            if combined is not None:
+                self.db.save_cached_summary(
+                    cache_key,
+                    json.dumps({"tech_trends": combined[0], "summary": combined[1]}, ensure_ascii=False),
+                )
+        else:
+            logger.info("Reusing cached weekly analysis for identical top projects")
+
+        if combined is not None:
+            tech_trends, weekly_summary = combined
+        else:
+            # Both LLM analyses only need the project list, so wait for max-of-two latencies.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                trends_future = executor.submit(self._analyze_trends, top_projects)
+                summary_future = executor.submit(self._analyze_weekly_summary, top_projects)
+                tech_trends = trends_future.result()
+                weekly_summary = summary_future.result()
 
         # Format report
         report = self._format_report(
@@ -97,72 +174,137 @@ class WeeklyReporter:
             "summary": weekly_summary
         }
 
-    def _deduplicate_projects(self, trends: List[Dict]) -> List[Dict]:
-        """Deduplicate projects, keeping highest stars"""
-        projects_map = {}
+    def analysis_cache_key(self, week_start: date, week_end: date, projects: List[Dict]) -> str:
+        """Stable hash of the week and everything that feeds the combined analysis prompt."""
+        payload = json.dumps(
+            [
+                "weekly",
+                self.model,
+                week_start.isoformat(),
+                week_end.isoformat(),
+                [(p['repo_name'], p.get('description'), p.get('language')) for p in projects[:10]],
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_cached_analysis(self, cache_key: str) -> Optional[Tuple[str, str]]:
+        """(tech_trends, summary) stored for this key, or None when absent or unreadable."""
+        cached = self.db.get_cached_summary(cache_key)
+        if not cached:
+            return None
+        try:
+            entry = json.loads(cached)
+            return entry["tech_trends"], entry["summary"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring unreadable cached weekly analysis")
+            return None
+
+    def _call_llm(self, prompt: str, *, system_prompt: str, temperature: float, label: str) -> str:
+        """
+        Call the shared LLM under the rate limiter, retrying transient failures (429/5xx/timeouts).
+
+        Waits honour Retry-After when present, otherwise back off exponentially
+        with jitter; other errors and the last failed attempt are re-raised so the
+        callers' fallbacks still apply.
+        """
+        for attempt in range(1, self.LLM_RETRY_MAX_ATTEMPTS + 1):
+            try:
+                self.rate_limiter.acquire_for_prompt(prompt, self.COMPLETION_TOKENS)
+                return call_shared_llm(
+                    prompt,
+                    system_prompt=system_prompt,
+                    model=self.model,
+                    temperature=temperature,
+                    timeout=120,
+                    base_url=self.ai_base_url,
+                    api_key=self.ai_api_key,
+                    reasoning_effort="xhigh",
+                )
+            except Exception as e:
+                if attempt >= self.LLM_RETRY_MAX_ATTEMPTS or not is_transient_llm_error(e):
+                    raise
+                delay = llm_retry_delay(attempt, e, self.LLM_RETRY_BACKOFF_MAX)
+                logger.info(
+                    "LLM %s hit a transient error (attempt %s/%s), retry in %.1fs: %s",
+                    label,
+                    attempt,
+                    self.LLM_RETRY_MAX_ATTEMPTS,
+                    delay,
+                    e,
+                )
+                time.sleep(delay)
+
+    def _analyze_combined(self, projects: List[Dict]) -> Optional[Tuple[str, str]]:
+        """Ask for trends and summary in one completion; None when it fails or cannot be split."""
+        prompt = self.COMBINED_PROMPT_PREFIX + "\n".join(
+            f"{idx}. {p['repo_name']}: {p.get('description') or ''} (Language: {p.get('language') or 'Unknown'})"
+            for idx, p in enumerate(projects[:10], 1)
+        )
 
-        for trend in trends:
-            repo_name = trend['repo_name']
-            if repo_name not in projects_map or trend['stars'] > projects_map[repo_name]['stars']:
-                projects_map[repo_name] = trend
+        try:
+            content = self._call_llm(
+                prompt,
+                system_prompt=self.COMBINED_SYSTEM_PROMPT,
+                temperature=0.4,
+                label="weekly combined analysis",
+            )
+        except Exception as e:
+            logger.warning(f"LLM combined weekly analysis failed: {e}")
+            return None
 
-        # Sort by stars_growth and stars
-        unique = list(projects_map.values())
-        unique.sort(key=lambda x: (x['stars_growth'], x['stars']), reverse=True)
+        trends_part, marker, summary_part = (content or "").partition(self.SUMMARY_MARKER)
+        tech_trends = trends_part.replace(self.TRENDS_MARKER, "").strip()
+        summary_text = summary_part.strip()
+        if not marker or not tech_trends or not summary_text:
+            logger.warning("LLM combined weekly analysis missing section markers, using separate calls")
+            return None
 
-        return unique
+        return tech_trends, self._ensure_summary_sections(summary_text, projects)
 
     def _analyze_trends(self, projects: List[Dict]) -> str:
         """Use LLM to analyze technology trends"""
 
-        # Prepare project summary
-        summary = []
-        for p in projects[:10]:  # Analyze top 10
-            summary.append(
-                f"- {p['repo_name']}: {p.get('description') or ''} ({p.get('language') or 'Unknown'})"
-            )
+        # Prepare project summary (top 10)
+        summary_block = "\n".join(
+            f"- {p['repo_name']}: {p.get('description') or ''} ({p.get('language') or 'Unknown'})"
+            for p in projects[:10]
+        )
 
         prompt = f"""分析以下本周GitHub AI趋势项目，总结技术趋势和热点方向（2-3条要点）：
 
-{chr(10).join(summary)}
+{summary_block}
 
 请返回简洁的趋势分析（每条1句话）。"""
 
         try:
-            return call_shared_llm(
+            return self._call_llm(
                 prompt,
                 system_prompt="你是AI技术趋势分析专家。",
-                model=self.model,
                 temperature=0.7,
-                timeout=120,
-                base_url=self.ai_base_url,
-                api_key=self.ai_api_key,
-                reasoning_effort="xhigh",
+                label="weekly trend analysis",
             )
 
         except Exception as e:
             logger.warning(f"LLM trend analysis failed: {e}")
             return "本周AI项目持续活跃，涵盖多个技术方向。"
 
-    def _analyze_weekly_summary(self, projects: List[Dict], tech_trends: str) -> str:
+    def _analyze_weekly_summary(self, projects: List[Dict], tech_trends: str = "") -> str:
         """Generate weekly AI summary and business value analysis."""
         if not projects:
             return self._format_empty_summary()
 
-        project_lines = []
-        for idx, project in enumerate(projects[:8], 1):
-            project_lines.append(
-                f"{idx}. {project['repo_name']}: {project.get('description') or ''} "
-                f"(Language: {project.get('language') or 'Unknown'})"
-            )
+        project_block = "\n".join(
+            f"{idx}. {project['repo_name']}: {project.get('description') or ''} "
+            f"(Language: {project.get('language') or 'Unknown'})"
+            for idx, project in enumerate(projects[:8], 1)
+        )
 
+        trends_reference = f"\n补充技术趋势参考：\n{tech_trends}\n" if tech_trends else ""
         prompt = f"""分析以下本周GitHub热门AI项目列表：
 
-{chr(10).join(project_lines)}
-
-补充技术趋势参考：
-{tech_trends}
-
+{project_block}
+{trends_reference}
 请完成以下任务：
 1. 给出“本周趋势总结”（一段话，聚焦核心技术方向和变化）。
 2. 评估这些项目对搜狐业务的价值，重点覆盖搜索引擎、推荐系统、AI基础设施（训练/推理/部署）。
@@ -175,15 +317,11 @@ class WeeklyReporter:
 """
 
         try:
-            summary_text = call_shared_llm(
+            summary_text = self._call_llm(
                 prompt,
                 system_prompt="你是资深AI技术战略分析师，擅长技术趋势和业务价值评估。",
-                model=self.model,
                 temperature=0.4,
-                timeout=120,
-                base_url=self.ai_base_url,
-                api_key=self.ai_api_key,
-                reasoning_effort="xhigh",
+                label="weekly summary",
             )
             summary_text = summary_text.strip()
             return self._ensure_summary_sections(summary_text, projects)
@@ -211,7 +349,7 @@ class WeeklyReporter:
 
     def _build_fallback_summary(self, projects: List[Dict]) -> str:
         """Build stable weekly summary when LLM output is unavailable."""
-        top_names = "、".join([p["repo_name"] for p in projects[:3]]) or "本周上榜项目"
+        top_names = "、".join(p["repo_name"] for p in projects[:3]) or "本周上榜项目"
         return (
             "## 本周趋势总结\n\n"
             f"本周热点主要集中在 Agent、LLM 应用与工程工具链，代表项目包括：{top_names}。\n\n"
@@ -222,30 +360,18 @@ class WeeklyReporter:
         )
 
     def _categorize_projects(self, projects: List[Dict]) -> Dict[str, int]:
-        """Categorize projects by technology area"""
-        categories = {
-            'LLM/NLP': 0,
-            '计算机视觉': 0,
-            'AI工具/框架': 0,
-            '多模态应用': 0,
-            '其他': 0
-        }
+        """Categorize projects by technology area; missing categories count as 0"""
+        categories = Counter()
 
         for p in projects:
-            reason = p.get('ai_relevance_reason', '').lower()
-            desc = p.get('description', '').lower()
-            text = reason + ' ' + desc
-
-            if any(kw in text for kw in ['llm', 'nlp', 'language', 'gpt', 'chatbot', 'embedding']):
-                categories['LLM/NLP'] += 1
-            elif any(kw in text for kw in ['vision', 'image', 'video', 'opencv', 'detection']):
-                categories['计算机视觉'] += 1
-            elif any(kw in text for kw in ['framework', 'tool', 'library', 'platform']):
-                categories['AI工具/框架'] += 1
-            elif any(kw in text for kw in ['multimodal', 'multi-modal', 'audio', 'speech']):
-                categories['多模态应用'] += 1
-            else:
-                categories['其他'] += 1
+            # No keyword contains a space, so none can span the old "reason desc" join;
+            # scanning the two fields separately finds the same keywords.
+            best = lowest_matching_group(
+                _CATEGORY_PATTERN,
+                p.get('ai_relevance_reason') or '',
+                p.get('description') or '',
+            )
+            categories[_CATEGORY_NAMES[best - 1] if best else '其他'] += 1
 
         return categories
 
@@ -261,40 +387,37 @@ class WeeklyReporter:
         total_stars = sum(p['stars_growth'] for p in projects)
         categories = self._categorize_projects(projects)
 
+        normalize = self._normalize_ai_highlight
+
+        # Top 10 projects: one block per project, description bound once via the inner for.
+        project_blocks = [
+            f"{idx}. **{p['repo_name']}** ⭐ {p['stars']:,} (+{p['stars_growth']})\n"
+            f"   📝 {description}\n"
+            f"   💡 AI亮点：{normalize(p.get('ai_relevance_reason') or '', description)}\n"
+            f"   🔗 [查看项目]({p['url']})\n"
+            for idx, p in enumerate(projects[:10], 1)
+            for description in (p.get('description') or '',)
+        ]
+        category_lines = [
+            f"- {emoji} {category}: {categories[category]}个"
+            for category, emoji in _CATEGORY_EMOJIS.items()
+            if categories[category] > 0
+        ]
+
         lines = [
             "📊 **本周AI趋势周报**",
-            f"\n📅 {week_start.strftime('%Y-%m-%d')} ~ {week_end.strftime('%Y-%m-%d')}",
+            f"\n📅 {week_start.isoformat()} ~ {week_end.isoformat()}",
             "\n## 📈 本周概览",
             f"- 发现 **{len(projects)}** 个AI相关项目",
             f"- 总计新增 **{total_stars:,}** stars",
-            "\n## 🏆 热门项目 Top 10\n"
-        ]
-
-        # Top 10 projects
-        for idx, p in enumerate(projects[:10], 1):
-            description = p.get('description') or ''
-            raw_highlight = p.get('ai_relevance_reason') or ""
-            ai_highlight = self._normalize_ai_highlight(raw_highlight, description)
-            lines.extend([
-                f"{idx}. **{p['repo_name']}** ⭐ {p['stars']:,} (+{p['stars_growth']})",
-                f"   📝 {description}",
-                f"   💡 AI亮点：{ai_highlight}",
-                f"   🔗 [查看项目]({p['url']})\n"
-            ])
-
-        # Tech trends
-        lines.extend([
+            "\n## 🏆 热门项目 Top 10\n",
+            *project_blocks,
             "\n## 🔥 技术趋势分析",
             tech_trends,
-            "\n## 📊 分类统计"
-        ])
-
-        for category, count in categories.items():
-            if count > 0:
-                emoji = self._get_category_emoji(category)
-                lines.append(f"- {emoji} {category}: {count}个")
-
-        lines.append("\n---\n⏰ 由GitHub-Trend-Bot自动推送")
+            "\n## 📊 分类统计",
+            *category_lines,
+            WeComNotifier.FOOTER,
+        ]
 
         return "\n".join(lines)
 
@@ -302,12 +425,10 @@ class WeeklyReporter:
         """Format empty report when no data"""
         return f"""📊 **本周AI趋势周报**
 
-📅 {week_start.strftime('%Y-%m-%d')} ~ {week_end.strftime('%Y-%m-%d')}
+📅 {week_start.isoformat()} ~ {week_end.isoformat()}
 
 ⚠️ 本周暂无AI趋势数据
-
----
-⏰ 由GitHub-Trend-Bot自动推送"""
+{WeComNotifier.FOOTER}"""
 
     @staticmethod
     def _format_empty_summary() -> str:
@@ -322,34 +443,8 @@ class WeeklyReporter:
     @staticmethod
     def _normalize_ai_highlight(reason: str, description: str = "") -> str:
         """Rewrite fallback/technical reasons into readable Chinese highlight."""
-        normalized = (reason or "").strip()
-        lower_reason = normalized.lower()
-        fallback_markers = (
-            "keyword-based detection",
-            "keyword based detection",
-            "llm unavailable"
-        )
-        if not normalized or any(marker in lower_reason for marker in fallback_markers):
-            desc_text = (description or "").lower()
-            if any(kw in desc_text for kw in ("agent", "assistant", "copilot", "workflow")):
-                area = "AI Agent/智能助手方向"
-            elif any(kw in desc_text for kw in ("llm", "gpt", "chat", "rag", "prompt")):
-                area = "LLM 应用方向"
-            elif any(kw in desc_text for kw in ("vision", "image", "video", "multimodal")):
-                area = "多模态/视觉方向"
-            else:
-                area = "AI 应用或工具方向"
-            return f"基于项目描述中的关键词判定，该项目与 {area}相关，建议后续结合 README 做进一步复核。"
-
-        return normalized
+        return normalize_ai_highlight(reason, description)
 
     def _get_category_emoji(self, category: str) -> str:
         """Get emoji for category"""
-        emoji_map = {
-            'LLM/NLP': '🤖',
-            '计算机视觉': '👁',
-            'AI工具/框架': '🛠',
-            '多模态应用': '🎨',
-            '其他': '📦'
-        }
-        return emoji_map.get(category, '📦')
+        return _CATEGORY_EMOJIS.get(category, '📦')
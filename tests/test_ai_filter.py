@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import patch
 from src.ai_filter import AIFilter, FilterResult
@@ -207,3 +208,326 @@ def test_is_ai_related_overrides_llm_false_negative_for_ai_native_tooling():
         assert result.category == "ai_native_tooling"
         assert "工具链" in result.reason or "运行时" in result.reason
         assert filter.last_filter_had_llm_failure is False
+
+
+def test_batch_filter_runs_concurrently_and_keeps_input_order():
+    """batch_filter should fan out LLM calls but return results in input order."""
+    def fake_llm(prompt, **_kwargs):
+        is_ai = "repo-skip" not in prompt
+        return json.dumps({"is_ai_related": is_ai, "reason": "llm reason"})
+
+    with patch("src.ai_filter.call_shared_llm", side_effect=fake_llm) as mocked_call:
+        filter = AIFilter(
+            base_url="https://gmn.chuangzuoli.com",
+            api_key="sk-test",
+            model="gpt-5.4",
+            max_concurrency=4,
+        )
+
+        projects = [
+            TrendingProject(
+                repo_name=f"org/{name}",
+                description="A generic utility",
+                language="Go",
+                url=f"https://github.com/org/{name}",
+                stars=10,
+                stars_growth=1,
+                ranking=idx,
+            )
+            for idx, name in enumerate(["repo-a", "repo-skip", "repo-b", "repo-c"], 1)
+        ]
+
+        results = filter.batch_filter(projects)
+
+    assert [project.repo_name for project, _ in results] == ["org/repo-a", "org/repo-b", "org/repo-c"]
+    assert mocked_call.call_count == 4
+    assert filter.last_filter_had_llm_failure is False
+
+
+def test_is_ai_related_reuses_cached_llm_answer_for_same_project(mock_llm_call):
+    """Repeated classification of an unchanged project should not hit the LLM again."""
+    filter = AIFilter(
+        base_url="https://gmn.chuangzuoli.com",
+        api_key="sk-test",
+        model="gpt-5.4",
+    )
+    project = TrendingProject(
+        repo_name="test/ml-project",
+        description="A machine learning framework for deep learning",
+        language="Python",
+        url="https://github.com/test/ml-project",
+        stars=1000,
+        stars_growth=100,
+        ranking=1
+    )
+
+    first = filter.is_ai_related(project)
+    second = filter.is_ai_related(project)
+
+    assert first == second
+    assert mock_llm_call.call_count == 1
+
+
+def test_is_ai_related_skips_llm_for_unambiguous_keyword_match(mock_llm_call):
+    """Unambiguous AI signals should be classified without an LLM round-trip."""
+    filter = AIFilter(
+        base_url="https://gmn.chuangzuoli.com",
+        api_key="sk-test",
+        model="gpt-5.4",
+    )
+    project = TrendingProject(
+        repo_name="test/vision-kit",
+        description="Training recipes for PyTorch models",
+        language="Python",
+        url="https://github.com/test/vision-kit",
+        stars=1000,
+        stars_growth=100,
+        ranking=1
+    )
+
+    result = filter.is_ai_related(project)
+
+    assert result.is_ai_related is True
+    assert result.reason
+    mock_llm_call.assert_not_called()
+
+
+def test_is_ai_related_parses_fenced_json_with_surrounding_text():
+    """Fenced or chatty JSON answers should still be parsed instead of falling back."""
+    response = '好的，结果如下：\n```JSON\n{"is_ai_related": true, "reason": "LLM 推理服务"}\n```'
+    with patch("src.ai_filter.call_shared_llm", return_value=response):
+        filter = AIFilter(
+            base_url="https://gmn.chuangzuoli.com",
+            api_key="sk-test",
+            model="gpt-5.4",
+        )
+        project = TrendingProject(
+            repo_name="test/serve",
+            description="High-throughput LLM serving engine",
+            language="Python",
+            url="https://github.com/test/serve",
+            stars=1000,
+            stars_growth=100,
+            ranking=1
+        )
+
+        result = filter.is_ai_related(project)
+
+    assert result.is_ai_related is True
+    assert result.reason == "LLM 推理服务"
+    assert filter.last_filter_had_llm_failure is False
+
+
+def test_is_ai_related_truncates_long_description_in_prompt(mock_llm_call):
+    """Only the head of a long description should be sent to the LLM."""
+    filter = AIFilter(
+        base_url="https://gmn.chuangzuoli.com",
+        api_key="sk-test",
+        model="gpt-5.4",
+    )
+    long_description = "Chat assistant. " + ("Z" * 500)
+    project = TrendingProject(
+        repo_name="test/long-desc",
+        description=long_description,
+        language="Python",
+        url="https://github.com/test/long-desc",
+        stars=1000,
+        stars_growth=100,
+        ranking=1
+    )
+
+    filter.is_ai_related(project)
+
+    prompt = mock_llm_call.call_args.args[0]
+    assert long_description[:AIFilter.CLASSIFICATION_DESCRIPTION_LIMIT] in prompt
+    assert long_description not in prompt
+
+
+def test_is_ai_related_retries_throttled_llm_call_with_backoff():
+    """429/timeout errors should be retried with backoff before falling back."""
+    filter = AIFilter(
+        base_url="https://gmn.chuangzuoli.com",
+        api_key="sk-test",
+        model="gpt-5.4",
+        timeout=120,
+        max_retries=1,
+    )
+    project = TrendingProject(
+        repo_name="test/vector-store",
+        description="A retrieval toolkit for embeddings",
+        language="Python",
+        url="https://github.com/test/vector-store",
+        stars=1000,
+        stars_growth=100,
+        ranking=1
+    )
+
+    with patch(
+        "src.ai_filter.call_shared_llm",
+        side_effect=[
+            RuntimeError("HTTP 429 Too Many Requests"),
+            TimeoutError("read timed out"),
+            '{"is_ai_related": true, "reason": "向量检索"}',
+        ],
+    ) as mocked_call, patch("src.ai_filter.time.sleep") as mocked_sleep:
+        result = filter.is_ai_related(project)
+
+    assert result.is_ai_related is True
+    assert result.reason == "向量检索"
+    assert mocked_call.call_count == 3
+    assert mocked_sleep.call_count == 2
+    assert filter.last_filter_had_llm_failure is False
+
+
+def test_generate_daily_summary_honours_retry_after_on_transient_error():
+    """Transient summary failures should back off for the server-suggested Retry-After."""
+    filter = AIFilter(
+        base_url="https://gmn.chuangzuoli.com",
+        api_key="sk-test",
+        model="gpt-5.4",
+        timeout=120,
+        max_retries=1,
+    )
+    projects = [(
+        TrendingProject(
+            repo_name="test/agent",
+            description="An agent runtime",
+            language="Python",
+            url="https://github.com/test/agent",
+            stars=1000,
+            stars_growth=100,
+            ranking=1
+        ),
+        FilterResult(is_ai_related=True, reason="Agent"),
+    )]
+
+    with patch(
+        "src.ai_filter.call_shared_llm",
+        side_effect=[
+            RuntimeError("503 Service Unavailable, Retry-After: 7"),
+            "## 每日趋势总结\n\n- 正常总结。",
+        ],
+    ) as mocked_call, patch("src.ai_filter.time.sleep") as mocked_sleep:
+        summary = filter.generate_daily_summary(projects)
+
+    assert summary == "## 每日趋势总结\n\n- 正常总结。"
+    assert filter.last_summary_had_llm_failure is False
+    assert mocked_call.call_count == 2
+    mocked_sleep.assert_called_once_with(7.0)
+
+
+def test_batch_filter_classifies_several_projects_per_prompt_with_per_project_fallback():
+    """Batched classification should cover most projects in one call and retry misses singly."""
+    def fake_llm(prompt, **_kwargs):
+        if '"results"' in prompt:
+            return json.dumps({"results": [
+                {"idx": 1, "is_ai_related": True, "reason": "batch yes"},
+                {"idx": 3, "is_ai_related": False, "reason": "batch no"},
+            ]})
+        return json.dumps({"is_ai_related": True, "reason": "single yes"})
+
+    with patch("src.ai_filter.call_shared_llm", side_effect=fake_llm) as mocked_call:
+        filter = AIFilter(
+            base_url="https://gmn.chuangzuoli.com",
+            api_key="sk-test",
+            model="gpt-5.4",
+            classification_batch_size=10,
+        )
+        projects = [
+            TrendingProject(
+                repo_name=f"org/{name}",
+                description="A generic utility",
+                language="Go",
+                url=f"https://github.com/org/{name}",
+                stars=10,
+                stars_growth=1,
+                ranking=idx,
+            )
+            for idx, name in enumerate(["repo-a", "repo-b", "repo-c"], 1)
+        ]
+
+        results = filter.batch_filter(projects)
+
+    assert [(project.repo_name, result.reason) for project, result in results] == [
+        ("org/repo-a", "batch yes"),
+        ("org/repo-b", "single yes"),
+    ]
+    assert mocked_call.call_count == 2
+
+
+def test_seeded_classification_skips_llm_and_only_new_answers_are_fresh(mock_llm_call):
+    """Answers loaded from the persistent cache should be reused and not re-reported as fresh."""
+    filter = AIFilter(
+        base_url="https://gmn.chuangzuoli.com",
+        api_key="sk-test",
+        model="gpt-5.4",
+    )
+    cached_project, new_project = [
+        TrendingProject(
+            repo_name=f"org/{name}",
+            description="A generic utility",
+            language="Go",
+            url=f"https://github.com/org/{name}",
+            stars=10,
+            stars_growth=1,
+            ranking=1,
+        )
+        for name in ("cached", "new")
+    ]
+    cached_key = filter.classification_cache_key(cached_project)
+    filter.seed_classification_cache({cached_key: {"is_ai_related": True, "reason": "from db"}})
+
+    assert filter.is_ai_related(cached_project).reason == "from db"
+    assert mock_llm_call.call_count == 0
+
+    filter.is_ai_related(new_project)
+
+    fresh = filter.pop_fresh_classifications()
+    assert list(fresh) == [filter.classification_cache_key(new_project)]
+    assert filter.pop_fresh_classifications() == {}
+
+
+def test_classification_cache_key_changes_with_prompt_fingerprint():
+    """Editing the classification prompts should stop old cached answers from matching."""
+    filter = AIFilter(
+        base_url="https://gmn.chuangzuoli.com",
+        api_key="sk-test",
+        model="gpt-5.4",
+    )
+    project = TrendingProject(
+        repo_name="org/repo",
+        description="An LLM agent runtime",
+        language="Python",
+        url="https://github.com/org/repo",
+        stars=10,
+        stars_growth=1,
+        ranking=1,
+    )
+    key = filter.classification_cache_key(project)
+
+    with patch.object(AIFilter, "CLASSIFICATION_PROMPT_FINGERPRINT", "edited"):
+        assert filter.classification_cache_key(project) != key
+    assert filter.classification_cache_key(project) == key
+
+
+def test_is_ai_related_skips_llm_for_obvious_non_ai_markup_project(mock_llm_call):
+    """Short CSS/HTML/Shell repos with no AI signal should be rejected without an LLM call."""
+    filter = AIFilter(
+        base_url="https://gmn.chuangzuoli.com",
+        api_key="sk-test",
+        model="gpt-5.4",
+    )
+    project = TrendingProject(
+        repo_name="someone/tiny-grid",
+        description="A tiny CSS grid",
+        language="CSS",
+        url="https://github.com/someone/tiny-grid",
+        stars=500,
+        stars_growth=50,
+        ranking=1
+    )
+
+    result = filter.is_ai_related(project)
+
+    assert result.is_ai_related is False
+    assert mock_llm_call.call_count == 0
@@ -108,3 +108,89 @@ logging:
 """)
         with pytest.raises(ConfigError, match="daily_hour.*between 0 and 23"):
             load_config(str(config_file))
+
+
+def test_invalid_ai_rate_limit():
+    """Optional ai.rpm/ai.tpm must be positive integers when present"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_file = Path(tmpdir) / "config.yaml"
+        config_file.write_text("""
+ai:
+  base_url: "https://gmn.chuangzuoli.com"
+  api_key: "sk-test"
+  model: "gpt-5.4"
+  rpm: 0
+wecom:
+  webhook_url: "https://qyapi.weixin.qq.com/test"
+tasks:
+  daily_limit: 5
+  weekly_limit: 25
+  daily_hour: 10
+  weekly_day: 5
+  weekly_hour: 16
+logging:
+  level: "INFO"
+  file: "logs/app.log"
+""")
+        with pytest.raises(ConfigError, match="ai.rpm"):
+            load_config(str(config_file))
+
+
+def test_boolean_ai_rate_limit_is_rejected():
+    """YAML true is an int in Python but must not pass as a 1-per-minute ai.tpm"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_file = Path(tmpdir) / "config.yaml"
+        config_file.write_text("""
+ai:
+  base_url: "https://gmn.chuangzuoli.com"
+  api_key: "sk-test"
+  model: "gpt-5.4"
+  tpm: true
+wecom:
+  webhook_url: "https://qyapi.weixin.qq.com/test"
+tasks:
+  daily_limit: 5
+  weekly_limit: 25
+  daily_hour: 10
+  weekly_day: 5
+  weekly_hour: 16
+logging:
+  level: "INFO"
+  file: "logs/app.log"
+""")
+        with pytest.raises(ConfigError, match="ai.tpm"):
+            load_config(str(config_file))
+
+
+def test_load_config_is_cached_until_file_changes():
+    """Repeated loads reuse the parsed config, return independent copies, and see edits"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_file = Path(tmpdir) / "config.yaml"
+        template = """
+ai:
+  base_url: "https://gmn.chuangzuoli.com"
+  api_key: "sk-test"
+  model: "{model}"
+wecom:
+  webhook_url: "https://qyapi.weixin.qq.com/test"
+tasks:
+  daily_limit: 5
+  weekly_limit: 25
+  daily_hour: 10
+  weekly_day: 5
+  weekly_hour: 16
+logging:
+  level: "INFO"
+  file: "logs/app.log"
+"""
+        config_file.write_text(template.format(model="gpt-5.4"))
+
+        first = load_config(str(config_file))
+        first['ai']['model'] = "mutated"
+        assert load_config(str(config_file))['ai']['model'] == "gpt-5.4"
+
+        config_file.write_text(template.format(model="gpt-next"))
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert load_config(str(config_file))['ai']['model'] == "gpt-next"
@@ -84,7 +84,8 @@ def test_run_daily_task_filter_llm_failure_notifies_agent_and_skips_push(
     mock_db.init_db.return_value = None
     mock_db.close.return_value = None
     mock_db.get_recently_pushed_repo_names.return_value = set()
-    mock_db.save_project.return_value = 1
+    mock_db.get_cached_summary.return_value = None
+    mock_db.save_projects.side_effect = lambda projects: [1] * len(projects)
     mock_db.save_trend_record.return_value = 1
 
     mock_scraper = mock_scraper_cls.return_value
@@ -125,7 +126,8 @@ def test_run_daily_task_summary_llm_failure_notifies_agent_and_skips_push(
     mock_db.init_db.return_value = None
     mock_db.close.return_value = None
     mock_db.get_recently_pushed_repo_names.return_value = set()
-    mock_db.save_project.return_value = 1
+    mock_db.get_cached_summary.return_value = None
+    mock_db.save_projects.side_effect = lambda projects: [1] * len(projects)
     mock_db.save_trend_record.return_value = 1
 
     mock_scraper = mock_scraper_cls.return_value
@@ -167,7 +169,8 @@ def test_run_daily_task_sends_markdown_attachment_via_openclaw_when_enabled(
     mock_db.init_db.return_value = None
     mock_db.close.return_value = None
     mock_db.get_recently_pushed_repo_names.return_value = set()
-    mock_db.save_project.return_value = 1
+    mock_db.get_cached_summary.return_value = None
+    mock_db.save_projects.side_effect = lambda projects: [1] * len(projects)
     mock_db.save_trend_record.return_value = 1
 
     mock_scraper = mock_scraper_cls.return_value
@@ -189,3 +192,55 @@ def test_run_daily_task_sends_markdown_attachment_via_openclaw_when_enabled(
     run_daily_task({**_config(), "openclaw": {"enabled": True}}, dry_run=False)
 
     openclaw.send_markdown_file.assert_called_once()
+
+
+@patch("main.Database")
+@patch("main.GitHubScraper")
+@patch("main.AIFilter")
+@patch("main.OpenClawNotifier")
+@patch("main.WeComNotifier")
+def test_run_daily_task_only_classifies_unseen_monthly_projects(
+    mock_notifier_cls,
+    mock_openclaw_cls,
+    mock_filter_cls,
+    mock_scraper_cls,
+    mock_db_cls,
+    tmp_path,
+    monkeypatch,
+):
+    monkeypatch.chdir(tmp_path)
+    mock_db = mock_db_cls.return_value
+    mock_db.get_recently_pushed_repo_names.return_value = set()
+    mock_db.get_cached_summary.return_value = None
+    mock_db.save_projects.side_effect = lambda projects: [1] * len(projects)
+
+    daily_project, daily_result = _ai_project("org/repo-a")
+    monthly_known, _ = _ai_project("org/repo-a")
+    monthly_new, monthly_new_result = _ai_project("org/repo-b")
+
+    mock_scraper = mock_scraper_cls.return_value
+    trending_by_period = {
+        "daily": [daily_project],
+        "weekly": [],
+        "monthly": [monthly_known, monthly_new],
+    }
+    mock_scraper.fetch_trending.side_effect = lambda since: trending_by_period[since]
+
+    mock_filter = mock_filter_cls.return_value
+    mock_filter.batch_filter.side_effect = [
+        [(daily_project, daily_result)],
+        [(monthly_new, monthly_new_result)],
+    ]
+    mock_filter.last_filter_had_llm_failure = False
+    mock_filter.last_summary_had_llm_failure = False
+    mock_filter.generate_daily_summary.return_value = "summary"
+
+    notifier = mock_notifier_cls.return_value
+    notifier.format_daily_report.return_value = "report"
+    mock_openclaw_cls.from_config.return_value.is_enabled = False
+
+    run_daily_task(_config(), dry_run=True)
+
+    assert mock_filter.batch_filter.call_args_list[1].args[0] == [monthly_new]
+    monthly_references = notifier.format_daily_report.call_args.kwargs["monthly_references"]
+    assert monthly_references == [(monthly_known, daily_result), (monthly_new, monthly_new_result)]
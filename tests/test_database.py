@@ -1,97 +1,319 @@
 import pytest
+import sqlite3
 import tempfile
 from pathlib import Path
 from datetime import date
 from src.database import Database, Project, TrendRecord
 
 
-def test_init_db_creates_tables():
-    """Test database initialization creates tables"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = Database(str(db_path))
-        db.init_db()
+@pytest.fixture
+def db():
+    """Fresh in-memory database with the schema applied; no temp files or fsyncs"""
+    database = Database(":memory:")
+    database.init_db()
+    yield database
+    database.close()
 
-        # Verify tables exist
-        cursor = db.conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = {row[0] for row in cursor.fetchall()}
-        assert 'projects' in tables
-        assert 'trend_records' in tables
-        assert 'weekly_reports' in tables
-        assert 'daily_push_records' in tables
+
+def test_init_db_creates_tables(db):
+    """Test database initialization creates tables"""
+    # Verify tables exist
+    cursor = db.conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    tables = {row[0] for row in cursor.fetchall()}
+    assert 'projects' in tables
+    assert 'trend_records' in tables
+    assert 'weekly_reports' in tables
+    assert 'daily_push_records' in tables
 
 
-def test_save_and_get_project():
+def test_save_and_get_project(db):
     """Test saving and retrieving project"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        db = Database(str(db_path))
-        db.init_db()
+    project = Project(
+        repo_name="test/repo",
+        description="Test description",
+        language="Python",
+        url="https://github.com/test/repo"
+    )
 
-        project = Project(
-            repo_name="test/repo",
-            description="Test description",
-            language="Python",
-            url="https://github.com/test/repo"
-        )
+    project_id = db.save_project(project)
+    assert project_id > 0
+
+    retrieved = db.get_project_by_name("test/repo")
+    assert retrieved.repo_name == "test/repo"
+    assert retrieved.description == "Test description"
+
+
+def test_save_projects_batch_returns_ids_in_input_order(db):
+    """Batch project save should upsert in one go and map every input row to its id"""
+    existing_id = db.save_project(Project("b/two", "old", "Python", "https://github.com/b/two"))
 
-        project_id = db.save_project(project)
-        assert project_id > 0
+    ids = db.save_projects([
+        Project("a/one", "first", "Python", "https://github.com/a/one"),
+        Project("b/two", "new", "Python", "https://github.com/b/two"),
+        Project("a/one", "first again", "Python", "https://github.com/a/one"),
+    ])
 
-        retrieved = db.get_project_by_name("test/repo")
-        assert retrieved.repo_name == "test/repo"
-        assert retrieved.description == "Test description"
+    assert ids[1] == existing_id
+    assert ids[0] == ids[2] != existing_id
+    assert db.get_project_by_name("b/two").description == "new"
+    assert db.get_project_by_name("a/one").description == "first again"
+    assert db.save_projects([]) == []
 
 
-def test_save_trend_record():
+def test_save_trend_record(db):
     """Test saving trend record"""
+    project = Project(
+        repo_name="test/repo",
+        description="Test",
+        language="Python",
+        url="https://github.com/test/repo"
+    )
+    project_id = db.save_project(project)
+
+    record = TrendRecord(
+        project_id=project_id,
+        date=date.today(),
+        stars=1000,
+        stars_growth=100,
+        trend_type="daily",
+        ranking=1,
+        ai_relevance_reason="Uses ML algorithms"
+    )
+
+    record_id = db.save_trend_record(record)
+    assert record_id > 0
+
+
+def test_daily_push_records_and_recent_query(db):
+    """Test saving daily push records and querying recent pushed repos"""
+    # Save historical push records (one commit for all three batches)
+    with db.transaction():
+        db.save_daily_push_records(["repo/old"], date(2026, 2, 1))
+        db.save_daily_push_records(["repo/recent1", "repo/recent2"], date(2026, 2, 10))
+        db.save_daily_push_records(["repo/today"], date(2026, 2, 12))
+
+    # Check recent 7 days up to 2026-02-12 (include 2026-02-12 itself)
+    recent = db.get_recently_pushed_repo_names(
+        lookback_days=7,
+        reference_date=date(2026, 2, 12)
+    )
+
+    assert "repo/recent1" in recent
+    assert "repo/recent2" in recent
+    assert "repo/today" in recent
+    assert "repo/old" not in recent
+
+
+def test_database_uses_wal_journal_mode():
+    """File-backed databases should run in WAL mode"""
     with tempfile.TemporaryDirectory() as tmpdir:
         db_path = Path(tmpdir) / "test.db"
         db = Database(str(db_path))
-        db.init_db()
 
-        project = Project(
-            repo_name="test/repo",
-            description="Test",
-            language="Python",
-            url="https://github.com/test/repo"
-        )
-        project_id = db.save_project(project)
-
-        record = TrendRecord(
-            project_id=project_id,
-            date=date.today(),
-            stars=1000,
-            stars_growth=100,
-            trend_type="daily",
-            ranking=1,
-            ai_relevance_reason="Uses ML algorithms"
+        journal_mode = db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert journal_mode == "wal"
+        db.close()
+
+
+def test_transaction_commits_once_and_rolls_back_on_error(db):
+    """Writes inside transaction() are committed together or not at all"""
+    with db.transaction():
+        db.save_project(Project("a/one", "desc", "Python", "https://github.com/a/one"))
+        db.save_project(Project("a/two", "desc", "Python", "https://github.com/a/two"))
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.save_project(Project("a/three", "desc", "Python", "https://github.com/a/three"))
+            raise RuntimeError("boom")
+
+    assert db.get_project_by_name("a/one") is not None
+    assert db.get_project_by_name("a/two") is not None
+    assert db.get_project_by_name("a/three") is None
+
+
+def test_nested_transaction_rolls_back_only_inner_block(db):
+    """A failed nested transaction() undoes its own writes and leaves the outer batch intact"""
+    with db.transaction():
+        db.save_project(Project("a/outer", "desc", "Python", "https://github.com/a/outer"))
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.save_project(Project("a/inner", "desc", "Python", "https://github.com/a/inner"))
+                raise RuntimeError("boom")
+        assert db.conn.in_transaction
+
+    assert not db.conn.in_transaction
+    assert db.get_project_by_name("a/outer") is not None
+    assert db.get_project_by_name("a/inner") is None
+
+
+def test_init_db_creates_trend_records_date_index(db):
+    """init_db should index trend_records by date for stats/weekly range scans"""
+    indexes = {
+        row[0] for row in db.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='trend_records'"
         )
+    }
+    assert "idx_trend_records_date" in indexes
+    assert db.conn.execute("PRAGMA temp_store").fetchone()[0] == 2
 
-        record_id = db.save_trend_record(record)
-        assert record_id > 0
 
+def test_init_db_skips_ddl_when_schema_version_is_current(db):
+    """A second init_db on a current schema should not re-run the table setup"""
+    assert db.conn.execute("PRAGMA user_version").fetchone()[0] == Database.SCHEMA_VERSION
+    db.conn.execute("DROP TABLE llm_summary_cache")
 
-def test_daily_push_records_and_recent_query():
-    """Test saving daily push records and querying recent pushed repos"""
+    db.init_db()
+    tables = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert "llm_summary_cache" not in tables
+
+    db.conn.execute("PRAGMA user_version = 0")
+    db.init_db()
+    tables = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert "llm_summary_cache" in tables
+
+
+def test_save_trend_records_batch_upserts_duplicates(db):
+    """Batch trend record save should insert new rows and refresh stars on existing ones"""
+    project_id = db.save_project(Project("test/repo", "Test", "Python", "https://github.com/test/repo"))
+    records = [
+        TrendRecord(project_id, date(2026, 2, 10), 1000, 100, "daily", 1, "reason"),
+        TrendRecord(project_id, date(2026, 2, 11), 1100, 120, "daily", 2, "reason"),
+    ]
+
+    db.save_trend_records(records)
+    db.save_trend_records([TrendRecord(project_id, date(2026, 2, 10), 1050, 150, "daily", 1, "reason")])
+
+    count = db.conn.execute("SELECT COUNT(*) FROM trend_records").fetchone()[0]
+    assert count == 2
+    row = db.conn.execute(
+        "SELECT stars, stars_growth FROM trend_records WHERE date = '2026-02-10'"
+    ).fetchone()
+    assert tuple(row) == (1050, 150)
+
+
+def test_summary_cache_round_trip(db):
+    """Cached summaries should be retrievable by key and overwritable"""
+    assert db.get_cached_summary("k1") is None
+    db.save_cached_summary("k1", "first")
+    db.save_cached_summary("k1", "second")
+
+    assert db.get_cached_summary("k1") == "second"
+
+
+def test_transaction_takes_write_lock_up_front():
+    """transaction() should BEGIN IMMEDIATE so other writers wait before any DML runs"""
     with tempfile.TemporaryDirectory() as tmpdir:
         db_path = Path(tmpdir) / "test.db"
         db = Database(str(db_path))
         db.init_db()
+        other = sqlite3.connect(str(db_path), timeout=0)
 
-        # Save historical push records
-        db.save_daily_push_records(["repo/old"], date(2026, 2, 1))
-        db.save_daily_push_records(["repo/recent1", "repo/recent2"], date(2026, 2, 10))
-        db.save_daily_push_records(["repo/today"], date(2026, 2, 12))
+        with db.transaction():
+            assert db.conn.in_transaction
+            with pytest.raises(sqlite3.OperationalError):
+                other.execute("INSERT INTO daily_push_records (repo_name, pushed_date) VALUES ('x/y', '2026-02-10')")
 
-        # Check recent 7 days up to 2026-02-12 (include 2026-02-12 itself)
-        recent = db.get_recently_pushed_repo_names(
-            lookback_days=7,
-            reference_date=date(2026, 2, 12)
-        )
+        assert not db.conn.in_transaction
+        other.close()
+        db.close()
+
+
+def test_classification_cache_round_trip_and_expiry(db):
+    """Cached classifications should be returned by key and dropped once older than the TTL"""
+    db.save_cached_classifications({
+        "fresh": {"is_ai_related": True, "reason": "LLM agent"},
+        "stale": {"is_ai_related": False, "reason": "CSS toolkit"},
+    })
+    db.conn.execute(
+        "UPDATE classification_cache SET created_at = datetime('now', '-30 days') WHERE cache_key = 'stale'"
+    )
+
+    cached = db.get_cached_classifications(["fresh", "stale", "missing"])
+
+    assert cached == {"fresh": {"is_ai_related": True, "reason": "LLM agent"}}
+
+
+def test_classification_cache_lookup_is_chunked(db):
+    """More keys than one IN (...) chunk should still all be looked up"""
+    keys = [f"key-{i}" for i in range(Database.ID_LOOKUP_CHUNK * 2 + 1)]
+    db.save_cached_classifications({key: {"is_ai_related": True, "reason": key} for key in keys})
+
+    cached = db.get_cached_classifications(keys)
+
+    assert len(cached) == len(keys)
+    assert cached[keys[-1]] == {"is_ai_related": True, "reason": keys[-1]}
+
+
+def test_recent_push_lookup_uses_covering_index(db):
+    """The recent-push window query should be served from the pushed_date index alone"""
+    plan = " ".join(
+        row[3] for row in db.conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT DISTINCT repo_name FROM daily_push_records
+            WHERE pushed_date >= '2026-02-05' AND pushed_date <= '2026-02-11'
+        """)
+    )
+
+    assert "COVERING INDEX idx_daily_push_records_pushed_date" in plan
+
+
+def test_save_project_and_trend_record_upsert_return_existing_ids(db):
+    """Re-saving should return the existing ids and refresh description/stars in one statement"""
+    project_id = db.save_project(Project("test/repo", "old", "Python", "https://github.com/test/repo"))
+    assert db.save_project(Project("test/repo", "new", "Python", "https://github.com/test/repo")) == project_id
+    assert db.get_project_by_name("test/repo").description == "new"
+
+    record_id = db.save_trend_record(TrendRecord(project_id, date(2026, 2, 10), 1000, 100, "daily", 1, "r"))
+    again = db.save_trend_record(TrendRecord(project_id, date(2026, 2, 10), 1200, 130, "daily", 1, "r"))
+
+    assert again == record_id
+    row = db.conn.execute(
+        "SELECT stars, stars_growth FROM trend_records WHERE id = ?", (record_id,)
+    ).fetchone()
+    assert tuple(row) == (1200, 130)
+
+
+def test_single_and_batch_trend_record_resaves_update_the_same_columns(db):
+    """Re-saving through save_trend_record or save_trend_records should leave identical rows"""
+    project_id = db.save_project(Project("test/repo", "Test", "Python", "https://github.com/test/repo"))
+    first = TrendRecord(project_id, date(2026, 2, 10), 1000, 100, "daily", 1, "r")
+    db.save_trend_record(first)
+    db.save_trend_records([TrendRecord(project_id, date(2026, 2, 11), 1000, 100, "daily", 1, "r")])
+
+    db.save_trend_record(TrendRecord(project_id, date(2026, 2, 10), 1500, 250, "daily", 1, "r"))
+    db.save_trend_records([TrendRecord(project_id, date(2026, 2, 11), 1500, 250, "daily", 1, "r")])
+
+    rows = db.conn.execute(
+        "SELECT stars, stars_growth FROM trend_records ORDER BY date"
+    ).fetchall()
+    assert [tuple(row) for row in rows] == [(1500, 250), (1500, 250)]
+
+
+def test_get_weekly_top_projects_dedupes_and_limits_in_sql(db):
+    """Weekly top projects keep each repo's highest-stars record, ordered by growth"""
+    ids = {
+        name: db.save_project(Project(repo_name=name, description="", language="Python",
+                                      url=f"https://github.com/{name}"))
+        for name in ("a/one", "b/two", "c/three")
+    }
+    rows = [
+        ("a/one", date(2026, 2, 2), 100, 90),
+        ("a/one", date(2026, 2, 3), 150, 10),
+        ("b/two", date(2026, 2, 3), 500, 40),
+        ("c/three", date(2026, 2, 4), 50, 5),
+        ("c/three", date(2026, 1, 20), 999, 999),
+    ]
+    db.save_trend_records([
+        TrendRecord(project_id=ids[name], date=day, stars=stars, stars_growth=growth,
+                    trend_type="daily", ranking=1, ai_relevance_reason="AI")
+        for name, day, stars, growth in rows
+    ])
+
+    top = db.get_weekly_top_projects(date(2026, 2, 2), date(2026, 2, 6), limit=2)
 
-        assert "repo/recent1" in recent
-        assert "repo/recent2" in recent
-        assert "repo/today" in recent
-        assert "repo/old" not in recent
+    assert [(row["repo_name"], row["stars"], row["stars_growth"]) for row in top] == [
+        ("b/two", 500, 40),
+        ("a/one", 150, 10),
+    ]
+    assert "record_rank" not in top[0]
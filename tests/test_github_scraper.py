@@ -37,3 +37,113 @@ def test_fetch_trending_uses_configured_timeout():
         "https://github.com/trending?since=daily",
         timeout=75,
     )
+
+
+TRENDING_HTML = """
+<html><body>
+<article class="Box-row">
+  <div class="float-right"><a href="/login" class="btn"><svg class="octicon octicon-star"></svg> Star</a></div>
+  <h2 class="h3 lh-condensed">
+    <a href="/acme/agent-kit" class="Link">
+      <span class="text-normal">acme /</span> agent-kit
+    </a>
+  </h2>
+  <p class="col-9 color-fg-muted my-1 pr-4">
+    An LLM <b>agent</b> toolkit
+  </p>
+  <div class="f6 color-fg-muted mt-2">
+    <span class="d-inline-block ml-0 mr-3">
+      <span itemprop="programmingLanguage">Python</span>
+    </span>
+    <a href="/acme/agent-kit/stargazers" class="Link"><svg class="octicon octicon-star"></svg> 12,345</a>
+    <span class="d-inline-block float-sm-right"><svg class="octicon octicon-star"></svg> 1,024 stars today</span>
+  </div>
+</article>
+<article class="Box-row">
+  <h2 class="h3 lh-condensed"><a href="/solo/plain">solo / plain</a></h2>
+  <div class="f6">
+    <span><svg class="octicon octicon-star"></svg> 1.2k</span>
+  </div>
+</article>
+<article class="Box-row"><p>no heading</p></article>
+</body></html>
+"""
+
+
+def test_fetch_trending_parses_trending_articles():
+    """Trending HTML should map to TrendingProject rows with rankings in page order."""
+    scraper = GitHubScraper()
+    response = Mock()
+    response.raise_for_status.return_value = None
+    response.text = TRENDING_HTML
+    scraper.session.get = Mock(return_value=response)
+
+    projects = scraper.fetch_trending("daily")
+
+    assert projects == [
+        TrendingProject(
+            repo_name="acme/agent-kit",
+            description="An LLMagenttoolkit",
+            language="Python",
+            url="https://github.com/acme/agent-kit",
+            stars=12345,
+            stars_growth=1024,
+            ranking=1,
+        ),
+        TrendingProject(
+            repo_name="solo/plain",
+            description="",
+            language="Unknown",
+            url="https://github.com/solo/plain",
+            stars=1200,
+            stars_growth=0,
+            ranking=2,
+        ),
+    ]
+
+
+def test_fetch_trending_reuses_cached_page_on_304(tmp_path):
+    """A cached ETag should be sent back, and a 304 should re-parse the stored page."""
+    from src.database import Database
+
+    db = Database(str(tmp_path / "test.db"))
+    db.init_db()
+    scraper = GitHubScraper(request_timeout=75, http_cache=db)
+
+    fresh = Mock(status_code=200, text=TRENDING_HTML, headers={"ETag": 'W/"abc"'})
+    fresh.raise_for_status.return_value = None
+    not_modified = Mock(status_code=304, text="", headers={})
+    scraper.session.get = Mock(side_effect=[fresh, not_modified])
+
+    first = scraper.fetch_trending("daily")
+    second = scraper.fetch_trending("daily")
+
+    assert second == first
+    assert len(second) == 2
+    _, kwargs = scraper.session.get.call_args
+    assert kwargs["headers"] == {"If-None-Match": 'W/"abc"'}
+    not_modified.raise_for_status.assert_not_called()
+    db.close()
+
+
+def test_bulk_field_collection_matches_per_article_parsing():
+    """Page-level XPath collection should yield the same projects as per-article lookups."""
+    from src.github_scraper import _XP_ARTICLES, _collect_article_fields, _parse_document
+
+    scraper = GitHubScraper()
+    tree = _parse_document(TRENDING_HTML)
+    articles = _XP_ARTICLES(tree)
+    fields = _collect_article_fields(tree, articles)
+
+    bulk = [scraper._parse_article(article, idx, f) for idx, (article, f) in enumerate(zip(articles, fields), 1)]
+    single = [scraper._parse_article(article, idx) for idx, article in enumerate(articles, 1)]
+
+    assert bulk == single
+
+
+def test_trending_project_uses_slots():
+    """TrendingProject rows should carry no per-instance __dict__"""
+    project = TrendingProject("a/b", "desc", "Python", "https://github.com/a/b", 10, 1, 1)
+
+    assert not hasattr(project, "__dict__")
+    assert project == TrendingProject("a/b", "desc", "Python", "https://github.com/a/b", 10, 1, 1)
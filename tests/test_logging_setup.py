@@ -0,0 +1,56 @@
+import logging
+import tempfile
+from pathlib import Path
+
+from src import logging_setup
+from src.logging_setup import start_queue_logging, stop_logging
+
+
+def test_start_queue_logging_reconfigures_on_second_call():
+    """A second setup should route records to the new log file, not the stopped queue"""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            first = Path(tmpdir) / "first.log"
+            second = Path(tmpdir) / "second.log"
+
+            start_queue_logging(str(first), "INFO")
+            start_queue_logging(str(second), "WARNING")
+            logging.getLogger("test").warning("hello")
+            stop_logging()
+
+            assert root.level == logging.WARNING
+            assert "hello" in second.read_text(encoding="utf-8")
+            assert "hello" not in first.read_text(encoding="utf-8")
+            for handler in root.handlers:
+                handler.close()
+    finally:
+        stop_logging()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+
+def test_stop_logging_closes_listener_handlers():
+    """Stopping (or reconfiguring) should close the old log file instead of leaking it"""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            start_queue_logging(str(Path(tmpdir) / "first.log"), "INFO")
+            first_handlers = logging_setup._LOG_LISTENER.handlers
+            start_queue_logging(str(Path(tmpdir) / "second.log"), "INFO")
+            second_handlers = logging_setup._LOG_LISTENER.handlers
+
+            first_file = next(h for h in first_handlers if isinstance(h, logging.FileHandler))
+            assert first_file.stream is None
+
+            stop_logging()
+            second_file = next(h for h in second_handlers if isinstance(h, logging.FileHandler))
+            assert second_file.stream is None
+            for handler in root.handlers:
+                handler.close()
+    finally:
+        stop_logging()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
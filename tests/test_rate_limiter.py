@@ -0,0 +1,61 @@
+from src.rate_limiter import TokenBucketRateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter_allows_burst_then_waits_for_refill():
+    """Requests beyond the per-minute budget should wait for the bucket to refill"""
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(requests_per_minute=2, clock=clock, sleep=clock.sleep)
+
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == []
+
+    limiter.acquire()
+    assert clock.sleeps == [30.0]
+
+
+def test_rate_limiter_paces_by_tokens_and_clamps_oversized_requests():
+    """Token budget should be enforced, and a request larger than capacity must not block forever"""
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(tokens_per_minute=600, clock=clock, sleep=clock.sleep)
+
+    limiter.acquire(tokens=500)
+    limiter.acquire(tokens=200)
+    assert clock.sleeps == [10.0]
+
+    limiter.acquire(tokens=10_000)
+    assert sum(clock.sleeps) == 10.0 + 60.0
+
+
+def test_rate_limiter_disabled_without_limits():
+    """No configured caps means acquire never waits"""
+    limiter = TokenBucketRateLimiter(sleep=lambda _: (_ for _ in ()).throw(AssertionError("slept")))
+
+    assert limiter.is_enabled is False
+    for _ in range(100):
+        limiter.acquire(tokens=1_000_000)
+
+
+def test_rate_limiter_sizes_prompt_reservation_from_prompt_length():
+    """acquire_for_prompt should reserve ~len/3 prompt tokens plus the expected completion"""
+    clock = FakeClock()
+    limiter = TokenBucketRateLimiter(tokens_per_minute=600, clock=clock, sleep=clock.sleep)
+
+    limiter.acquire_for_prompt("x" * 1200, completion_tokens=200)
+    assert clock.sleeps == []
+
+    limiter.acquire_for_prompt("x" * 30, completion_tokens=50)
+    assert clock.sleeps == [6.0]
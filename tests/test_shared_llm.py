@@ -1,6 +1,6 @@
 from unittest.mock import patch
 
-from src.shared_llm import call_shared_llm
+from src.shared_llm import call_shared_llm, is_transient_llm_error
 
 
 def test_call_shared_llm_normalizes_blank_base_url_and_api_key_to_none():
@@ -22,3 +22,49 @@ def test_call_shared_llm_normalizes_blank_base_url_and_api_key_to_none():
     assert kwargs["api_key"] is None
     assert kwargs["model"] == "gpt-5.4"
     assert kwargs["reasoning_effort"] == "xhigh"
+
+
+def test_load_shared_llm_module_executes_client_once_under_concurrency(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    import src.shared_llm as shared_llm
+
+    client_file = tmp_path / "llm_client.py"
+    counter_file = tmp_path / "loads.txt"
+    client_file.write_text(
+        "import time\n"
+        f"with open({str(counter_file)!r}, 'a') as f:\n"
+        "    f.write('x')\n"
+        "time.sleep(0.05)\n"
+    )
+    monkeypatch.setenv("SHARED_LLM_CLIENT_PATH", str(client_file))
+    monkeypatch.setattr(shared_llm, "_SHARED_LLM_MODULE", None)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        modules = list(executor.map(lambda _: shared_llm._load_shared_llm_module(), range(8)))
+
+    assert len({id(module) for module in modules}) == 1
+    assert counter_file.read_text() == "x"
+
+
+def test_is_transient_llm_error_matches_throttling_timeouts_and_5xx():
+    for message in (
+        "HTTP 429 Too Many Requests",
+        "Error code: 502 - Bad Gateway",
+        "Rate limit reached for requests",
+        "Read timed out. (read timeout=120)",
+        "upstream connect timeout",
+        "Connection reset by peer",
+    ):
+        assert is_transient_llm_error(RuntimeError(message)), message
+    assert is_transient_llm_error(TimeoutError("x"))
+
+
+def test_is_transient_llm_error_rejects_4xx_messages_containing_5xx_digits():
+    for message in (
+        "Error code: 400 - max_tokens must be <= 4500",
+        "context length 15000 exceeded",
+        "invalid value for timeout: -1",
+        "Error code: 401 - invalid api key",
+    ):
+        assert not is_transient_llm_error(RuntimeError(message)), message
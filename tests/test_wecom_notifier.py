@@ -1,3 +1,6 @@
+import json
+import socket
+import threading
 import pytest
 from unittest.mock import Mock, patch
 from src.wecom_notifier import WeComNotifier
@@ -12,8 +15,10 @@ def mock_requests():
     with patch('src.wecom_notifier.requests') as mock:
         response = Mock()
         response.status_code = 200
+        response.content = b'{"errcode":0,"errmsg":"ok"}'
         response.json.return_value = {"errcode": 0, "errmsg": "ok"}
         mock.post.return_value = response
+        mock.Session.return_value = mock
         yield mock
 
 
@@ -56,7 +61,8 @@ def test_send_notification(mock_requests):
 
     call_args = mock_requests.post.call_args
     assert call_args[0][0] == "https://test.webhook.url"
-    assert call_args[1]['json']['msgtype'] == 'markdown'
+    assert json.loads(call_args[1]['data'])['msgtype'] == 'markdown'
+    assert call_args[1]['headers']['Content-Type'] == "application/json; charset=utf-8"
 
 
 def test_format_daily_push_messages_split():
@@ -159,20 +165,36 @@ def test_send_weekly_report_split(mock_requests):
     assert mock_requests.post.call_count == 2
 
 
+def test_send_prepared_sends_messages_as_given(mock_requests):
+    """Pre-formatted messages should be posted in order without re-formatting"""
+    notifier = WeComNotifier("https://test.webhook.url")
+
+    with patch.object(notifier, "format_weekly_push_messages") as mock_format:
+        success = notifier.send_prepared("trend", "summary")
+
+    assert success is True
+    mock_format.assert_not_called()
+    bodies = [json.loads(call[1]['data'])['markdown']['content'] for call in mock_requests.post.call_args_list]
+    assert bodies == ["trend", "summary"]
+
+
 def test_send_markdown_retries_with_shorter_content_on_api_error():
     """Should auto-shorten and retry once when WeCom API returns an error."""
     with patch('src.wecom_notifier.requests') as mock_requests_lib:
         first = Mock()
         first.status_code = 200
         first.raise_for_status.return_value = None
+        first.content = b'{"errcode":45002,"errmsg":"content too long"}'
         first.json.return_value = {"errcode": 45002, "errmsg": "content too long"}
 
         second = Mock()
         second.status_code = 200
         second.raise_for_status.return_value = None
+        second.content = b'{"errcode":0,"errmsg":"ok"}'
         second.json.return_value = {"errcode": 0, "errmsg": "ok"}
 
         mock_requests_lib.post.side_effect = [first, second]
+        mock_requests_lib.Session.return_value = mock_requests_lib
 
         notifier = WeComNotifier("https://test.webhook.url")
         success = notifier.send_markdown("A" * 6000)
@@ -180,8 +202,8 @@ def test_send_markdown_retries_with_shorter_content_on_api_error():
         assert success is True
         assert mock_requests_lib.post.call_count == 2
 
-        first_payload = mock_requests_lib.post.call_args_list[0][1]["json"]["markdown"]["content"]
-        second_payload = mock_requests_lib.post.call_args_list[1][1]["json"]["markdown"]["content"]
+        first_payload = json.loads(mock_requests_lib.post.call_args_list[0][1]["data"])["markdown"]["content"]
+        second_payload = json.loads(mock_requests_lib.post.call_args_list[1][1]["data"])["markdown"]["content"]
 
         assert len(second_payload.encode("utf-8")) < len(first_payload.encode("utf-8"))
         assert "自动精简重发" in second_payload
@@ -217,6 +239,13 @@ def test_format_daily_top_message_rewrites_unavailable_reason():
     assert "能解决什么问题：主要解决多步骤任务需要人工串联、规划和执行的问题" in message
 
 
+def test_normalize_ai_highlight_finds_overlapping_keywords():
+    """A lower-priority keyword overlapping a higher one ("rag" in "ragent") must not hide it."""
+    highlight = WeComNotifier._normalize_ai_highlight("", "ragent framework")
+
+    assert "AI Agent/智能助手方向" in highlight
+
+
 def test_split_messages_respect_wecom_markdown_limit():
     """Test split messages stay within WeCom markdown length limit"""
     notifier = WeComNotifier("https://test.webhook.url")
@@ -404,3 +433,143 @@ def test_format_daily_report_uses_detailed_local_intro_and_appends_weekly_monthl
     assert "📝 项目描述：Unofficial Python API for Google NotebookLM" in trend_message
     assert "💡 AI亮点：" in trend_message
     assert "📌 项目介绍：" not in trend_message
+
+
+def test_notifier_reuses_one_session_for_all_pushes(mock_requests):
+    """Split pushes should share one pooled session instead of a new connection each."""
+    notifier = WeComNotifier("https://test.webhook.url")
+
+    notifier.send_markdown("first")
+    notifier.send_markdown("second")
+    notifier.close()
+
+    mock_requests.Session.assert_called_once_with()
+    assert mock_requests.post.call_count == 2
+    mock_requests.close.assert_called_once_with()
+
+
+def test_read_timeout_is_not_retried():
+    """A push that times out after being sent may already be stored, so it must not be re-posted."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(4)
+    server.settimeout(0.1)
+    attempts = []
+    open_conns = []
+    done = threading.Event()
+
+    def accept_and_hang():
+        # Read each request but never answer, so the client hits its read timeout.
+        while not done.is_set():
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            attempts.append(conn.recv(65536))
+            open_conns.append(conn)
+
+    acceptor = threading.Thread(target=accept_and_hang, daemon=True)
+    acceptor.start()
+    notifier = WeComNotifier(f"http://127.0.0.1:{server.getsockname()[1]}/webhook")
+    notifier.REQUEST_TIMEOUT = (1, 0.2)
+    try:
+        assert notifier.send_markdown("hello") is False
+    finally:
+        notifier.close()
+        done.set()
+        acceptor.join(timeout=5)
+        server.close()
+        for conn in open_conns:
+            conn.close()
+
+    assert len(attempts) == 1
+
+
+def test_fit_markdown_limit_cuts_on_character_boundary():
+    notifier = WeComNotifier("https://example.com/webhook")
+    content = "中文😀" * 2000
+
+    fitted = notifier._fit_markdown_limit(content)
+
+    assert len(fitted.encode("utf-8")) <= notifier.PUSH_MARKDOWN_LIMIT
+    assert fitted.endswith("（内容过长，已截断）")
+    assert content.startswith(fitted[: -len("\n\n（内容过长，已截断）")])
+
+
+def test_truncate_by_bytes_backs_up_to_character_start():
+    text = "a😀中"  # 1 + 4 + 3 bytes
+
+    assert WeComNotifier._truncate_by_bytes(text, 4) == "a"
+    assert WeComNotifier._truncate_by_bytes(text, 5) == "a😀"
+    assert WeComNotifier._truncate_by_bytes(text, 7) == "a😀"
+    assert WeComNotifier._truncate_by_bytes(text, 8) == text
+
+
+def test_fit_markdown_limit_handles_long_ascii_content():
+    notifier = WeComNotifier("https://example.com/webhook")
+    content = "x" * (notifier.PUSH_MARKDOWN_LIMIT * 2)
+
+    fitted = notifier._fit_markdown_limit(content)
+
+    assert len(fitted.encode("utf-8")) <= notifier.PUSH_MARKDOWN_LIMIT
+    assert fitted.endswith("（内容过长，已截断）")
+    assert notifier._fit_markdown_limit("short ascii") == "short ascii"
+
+
+def test_format_daily_report_reuses_rendered_markdown_for_same_inputs():
+    notifier = WeComNotifier("https://example.com/webhook")
+    project = TrendingProject(
+        repo_name="owner/repo",
+        description="LLM agent toolkit",
+        language="Python",
+        url="https://github.com/owner/repo",
+        stars=1000,
+        stars_growth=50,
+        ranking=1,
+    )
+    pairs = [(project, FilterResult(True, "LLM agent toolkit"))]
+
+    with patch.object(notifier, "_build_daily_message", wraps=notifier._build_daily_message) as build:
+        first = notifier.format_daily_report(pairs, date(2026, 2, 3), "summary")
+        second = notifier.format_daily_report(list(pairs), date(2026, 2, 3), "summary")
+        project.stars_growth = 60
+        third = notifier.format_daily_report(pairs, date(2026, 2, 3), "summary")
+
+    assert first == second
+    assert "+60" in third
+    assert build.call_count == 2
+
+
+def test_split_send_only_waits_for_remaining_interval(mock_requests):
+    notifier = WeComNotifier("https://example.com/webhook")
+
+    with patch("src.wecom_notifier.time.monotonic", side_effect=[100.0, 100.4, 100.4]), \
+            patch("src.wecom_notifier.time.sleep") as sleep:
+        assert notifier.send_weekly_report_split("report", date(2026, 2, 2), date(2026, 2, 8))
+
+    sleep.assert_called_once()
+    assert sleep.call_args[0][0] == pytest.approx(0.6)
+
+
+def test_send_markdown_skips_json_decode_for_plain_success(mock_requests):
+    notifier = WeComNotifier("https://test.webhook.url")
+
+    assert notifier.send_markdown("hello") is True
+    mock_requests.post.return_value.json.assert_not_called()
+
+    mock_requests.post.return_value.content = b'{"errcode":93000,"errmsg":"invalid webhook url"}'
+    mock_requests.post.return_value.json.return_value = {"errcode": 93000, "errmsg": "invalid webhook url"}
+    assert notifier.send_markdown("hello") is False
+
+
+def test_send_markdown_posts_compact_utf8_json_body(mock_requests):
+    """Chinese content should go out as raw UTF-8 JSON rather than \\u escapes"""
+    notifier = WeComNotifier("https://test.webhook.url")
+
+    notifier.send_markdown("今日趋势")
+
+    body = mock_requests.post.call_args[1]['data']
+    assert isinstance(body, bytes)
+    assert "今日趋势".encode("utf-8") in body
+    assert b"\\u" not in body
+    assert json.loads(body) == {"msgtype": "markdown", "markdown": {"content": "今日趋势"}}
@@ -8,7 +8,8 @@ from src.weekly_reporter import WeeklyReporter
 def mock_database():
     """Mock database"""
     db = Mock()
-    db.get_weekly_trends.return_value = [
+    db.get_cached_summary.return_value = None
+    db.get_weekly_top_projects.return_value = [
         {
             'repo_name': 'test/ml-lib',
             'description': 'ML library',
@@ -48,7 +49,11 @@ def mock_llm_client():
 - 搜索引擎：可用于检索增强与结果摘要。
 - 推荐系统：可用于标签补全与排序优化。"""
 
-        mocked_call.side_effect = [trend_response, summary_response]
+        # The two analyses run concurrently, so answer by prompt rather than call order.
+        def respond(prompt, **kwargs):
+            return summary_response if "搜狐业务价值分析" in prompt else trend_response
+
+        mocked_call.side_effect = respond
         yield mocked_call
 
 
@@ -112,7 +117,8 @@ def test_generate_report_package_contains_weekly_summary(mock_database, mock_llm
 def test_generate_weekly_report_rewrites_unavailable_reason(mock_llm_client):
     """Weekly report should rewrite unreadable fallback reason to Chinese highlight."""
     db = Mock()
-    db.get_weekly_trends.return_value = [
+    db.get_cached_summary.return_value = None
+    db.get_weekly_top_projects.return_value = [
         {
             "repo_name": "test/openclaw-like",
             "description": "Your own personal AI assistant with agent workflow",
@@ -143,9 +149,10 @@ def test_generate_weekly_report_rewrites_unavailable_reason(mock_llm_client):
 def test_generate_weekly_report_keeps_full_local_content_without_truncation(mock_llm_client):
     """Weekly local history report should keep full description and AI highlight."""
     db = Mock()
+    db.get_cached_summary.return_value = None
     long_desc = "WEEKLY-DESC-" + ("X" * 260)
     long_reason = "WEEKLY-REASON-" + ("Y" * 320)
-    db.get_weekly_trends.return_value = [
+    db.get_weekly_top_projects.return_value = [
         {
             "repo_name": "test/full-weekly-local",
             "description": long_desc,
@@ -171,3 +178,167 @@ def test_generate_weekly_report_keeps_full_local_content_without_truncation(mock
 
     assert long_desc in report
     assert long_reason in report
+
+
+def test_normalize_ai_highlight_finds_overlapping_keywords():
+    """A lower-priority keyword overlapping a higher one ("rag" in "ragent") must not hide it."""
+    highlight = WeeklyReporter._normalize_ai_highlight("", "ragent framework")
+
+    assert "AI Agent/智能助手方向" in highlight
+
+
+def test_categorize_projects_prefers_earlier_category_over_position():
+    reporter = WeeklyReporter(
+        database=Mock(),
+        ai_base_url="https://gmn.chuangzuoli.com",
+        ai_api_key="sk-test",
+        ai_model="gpt-5.4"
+    )
+    projects = [
+        {'ai_relevance_reason': 'image tool', 'description': 'built on llm'},
+        {'ai_relevance_reason': 'speech platform', 'description': ''},
+        {'ai_relevance_reason': 'audio', 'description': 'transcription'},
+        {'ai_relevance_reason': '', 'description': 'misc'},
+    ]
+
+    categories = reporter._categorize_projects(projects)
+
+    expected = {
+        'LLM/NLP': 1,
+        '计算机视觉': 0,
+        'AI工具/框架': 1,
+        '多模态应用': 1,
+        '其他': 1,
+    }
+    assert {name: categories[name] for name in expected} == expected
+
+
+def test_categorize_projects_finds_overlapping_keywords():
+    """"tool" overlapping the start of "llm" in "toollm" must not hide the LLM category"""
+    reporter = WeeklyReporter(
+        database=Mock(),
+        ai_base_url="https://gmn.chuangzuoli.com",
+        ai_api_key="sk-test",
+        ai_model="gpt-5.4"
+    )
+
+    categories = reporter._categorize_projects([{'ai_relevance_reason': 'toollm', 'description': ''}])
+
+    assert categories['LLM/NLP'] == 1
+    assert categories['AI工具/框架'] == 0
+
+
+def test_generate_report_package_runs_trend_and_summary_calls_concurrently(mock_database):
+    import threading
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def respond(prompt, **kwargs):
+        if WeeklyReporter.SUMMARY_MARKER in prompt:
+            return "no section markers"  # force the separate-call fallback
+        barrier.wait()  # only returns once both LLM calls are in flight
+        if "搜狐业务价值分析" in prompt:
+            return "## 本周趋势总结\n\n并发总结\n\n🚀 **搜狐业务价值分析**\n\n- 搜索"
+        return "并发趋势"
+
+    reporter = WeeklyReporter(
+        database=mock_database,
+        ai_base_url="https://gmn.chuangzuoli.com",
+        ai_api_key="sk-test",
+        ai_model="gpt-5.4"
+    )
+    with patch("src.weekly_reporter.call_shared_llm", side_effect=respond):
+        package = reporter.generate_report_package(date(2026, 2, 3), date(2026, 2, 7))
+
+    assert "并发趋势" in package["report"]
+    assert "并发总结" in package["summary"]
+
+
+def test_generate_report_package_uses_single_combined_llm_call(mock_database):
+    combined = """===TRENDS===
+1. Agent 框架持续升温
+
+===SUMMARY===
+## 本周趋势总结
+
+本周聚焦 Agent。
+
+🚀 **搜狐业务价值分析**
+
+- 推荐系统：可用于标签补全。"""
+
+    reporter = WeeklyReporter(
+        database=mock_database,
+        ai_base_url="https://gmn.chuangzuoli.com",
+        ai_api_key="sk-test",
+        ai_model="gpt-5.4"
+    )
+    with patch("src.weekly_reporter.call_shared_llm", return_value=combined) as mocked_call:
+        package = reporter.generate_report_package(date(2026, 2, 3), date(2026, 2, 7))
+
+    assert mocked_call.call_count == 1
+    assert "Agent 框架持续升温" in package["report"]
+    assert "===" not in package["report"]
+    assert package["summary"].startswith("## 本周趋势总结")
+    assert "搜狐业务价值分析" in package["summary"]
+
+
+def test_weekly_summary_retries_transient_llm_error_before_falling_back(mock_database):
+    summary = "## 本周趋势总结\n\n重试成功\n\n🚀 **搜狐业务价值分析**\n\n- 搜索"
+    reporter = WeeklyReporter(
+        database=mock_database,
+        ai_base_url="https://gmn.chuangzuoli.com",
+        ai_api_key="sk-test",
+        ai_model="gpt-5.4"
+    )
+
+    with patch(
+        "src.weekly_reporter.call_shared_llm",
+        side_effect=[RuntimeError("429 Too Many Requests, retry-after: 2"), summary],
+    ) as mocked_call, patch("src.weekly_reporter.time.sleep") as mocked_sleep:
+        result = reporter._analyze_weekly_summary(mock_database.get_weekly_top_projects.return_value)
+
+    assert mocked_call.call_count == 2
+    mocked_sleep.assert_called_once_with(2.0)
+    assert "重试成功" in result
+
+
+def test_generate_report_package_reuses_cached_weekly_analysis(mock_database):
+    combined = "===TRENDS===\n1. Agent 升温\n===SUMMARY===\n## 本周趋势总结\n\n缓存\n\n🚀 **搜狐业务价值分析**\n\n- 搜索"
+    store = {}
+    mock_database.get_cached_summary.side_effect = store.get
+    mock_database.save_cached_summary.side_effect = store.__setitem__
+    reporter = WeeklyReporter(
+        database=mock_database,
+        ai_base_url="https://gmn.chuangzuoli.com",
+        ai_api_key="sk-test",
+        ai_model="gpt-5.4"
+    )
+
+    with patch("src.weekly_reporter.call_shared_llm", return_value=combined) as mocked_call:
+        first = reporter.generate_report_package(date(2026, 2, 3), date(2026, 2, 7))
+        second = reporter.generate_report_package(date(2026, 2, 3), date(2026, 2, 7))
+
+    assert mocked_call.call_count == 1
+    assert first == second
+    assert "Agent 升温" in second["report"]
+
+
+def test_weekly_reporter_spends_from_injected_shared_rate_limiter(mock_database, mock_llm_client):
+    limiter = Mock()
+    reporter = WeeklyReporter(
+        database=mock_database,
+        ai_base_url="https://gmn.chuangzuoli.com",
+        ai_api_key="sk-test",
+        ai_model="gpt-5.4",
+        requests_per_minute=1,
+        rate_limiter=limiter,
+    )
+
+    reporter.generate_report_package(date(2026, 2, 2), date(2026, 2, 6), 25)
+
+    assert reporter.rate_limiter is limiter
+    assert limiter.acquire_for_prompt.call_count == mock_llm_client.call_count
+    prompt, completion_tokens = limiter.acquire_for_prompt.call_args.args
+    assert "test/ml-lib" in prompt
+    assert completion_tokens == WeeklyReporter.COMPLETION_TOKENS
@@ -3,25 +3,31 @@
 import sys
 import argparse
 import logging
-from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
 
 from src.config_loader import load_config, ConfigError
-from src.database import Database
-from src.weekly_reporter import WeeklyReporter
-from src.wecom_notifier import WeComNotifier
+from src.history_writer import write_history_file
+from src.logging_setup import start_queue_logging, stop_logging
+
+# src.database / src.weekly_reporter / src.wecom_notifier are imported where used:
+# requests alone costs ~130ms, which --help and config errors should not pay.
+
+logger = logging.getLogger(__name__)
 
 
 def compose_weekly_history(report: str, summary: str) -> str:
     """Compose a single markdown file for local weekly history."""
-    footer = "\n---\n⏰ 由GitHub-Trend-Bot自动推送"
-    report_without_footer = report.rsplit(footer, 1)[0] if footer in report else report
-    summary_without_footer = summary.rsplit(footer, 1)[0] if footer in summary else summary
+    from src.wecom_notifier import WeComNotifier
 
+    footer = WeComNotifier.FOOTER
+    # Reports always end with the footer, so drop it as a suffix instead of searching for it.
     return "\n".join([
-        report_without_footer,
+        report.removesuffix(footer),
         "\n---\n",
-        summary_without_footer,
+        summary.removesuffix(footer),
         footer
     ])
 
@@ -29,18 +35,9 @@ def compose_weekly_history(report: str, summary: str) -> str:
 def setup_logging(config: dict):
     """Setup logging configuration"""
     log_config = config.get('logging', {})
-    log_file = log_config.get('file', 'logs/app.log').replace('app.log', 'weekly.log')
-    log_level = log_config.get('level', 'INFO')
-
-    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
-
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
+    start_queue_logging(
+        log_config.get('file', 'logs/app.log').replace('app.log', 'weekly.log'),
+        log_config.get('level', 'INFO'),
     )
 
 
@@ -57,28 +54,24 @@ def get_week_range(target_date: date = None) -> tuple[date, date]:
     if target_date is None:
         target_date = date.today()
 
-    # Get Monday of the week
-    days_since_monday = target_date.weekday()
-    week_start = target_date - timedelta(days=days_since_monday)
-
-    # Get Friday of the week
-    week_end = week_start + timedelta(days=4)
-
-    return week_start, week_end
+    # Monday and Friday of the week, computed on day ordinals (no timedelta objects)
+    monday = target_date.toordinal() - target_date.weekday()
+    return date.fromordinal(monday), date.fromordinal(monday + 4)
 
 
 def run_weekly_task(config: dict, dry_run: bool = False, week_start: date = None):
     """Run weekly report task"""
-    logger = logging.getLogger(__name__)
+    from src.database import Database
+    from src.weekly_reporter import WeeklyReporter
+    from src.wecom_notifier import WeComNotifier
+
     logger.info("Starting weekly report task")
 
-    # Get week range
-    if week_start:
-        week_end = week_start + timedelta(days=4)
-    else:
-        week_start, week_end = get_week_range()
+    # Any date (default: today) resolves to its own Monday-Friday, so a mid-week
+    # --week-start cannot produce a window that straddles two weeks.
+    week_start, week_end = get_week_range(week_start)
 
-    logger.info(f"Generating report for {week_start} to {week_end}")
+    logger.info("Generating report for %s to %s", week_start, week_end)
 
     # Initialize components
     db = Database()
@@ -87,7 +80,9 @@ def run_weekly_task(config: dict, dry_run: bool = False, week_start: date = None
         database=db,
         ai_base_url=config['ai']['base_url'],
         ai_api_key=config['ai']['api_key'],
-        ai_model=config['ai']['model']
+        ai_model=config['ai']['model'],
+        requests_per_minute=config['ai'].get('rpm'),
+        tokens_per_minute=config['ai'].get('tpm'),
     )
     notifier = WeComNotifier(config['wecom']['webhook_url'])
 
@@ -106,54 +101,59 @@ def run_weekly_task(config: dict, dry_run: bool = False, week_start: date = None
         history_file = history_dir / f"{week_end.isoformat()}-weekly.md"
         history_content = compose_weekly_history(report, summary)
 
-        try:
-            with open(history_file, 'w', encoding='utf-8') as f:
-                f.write(history_content)
-            logger.info(f"✓ Weekly report saved to {history_file}")
-        except Exception as e:
-            logger.error(f"Failed to save history: {e}")
+        # The history write is pure disk I/O; overlap it with the WeCom round-trips.
+        with ThreadPoolExecutor(max_workers=1) as history_executor:
+            history_future = history_executor.submit(write_history_file, history_file, history_content)
 
-        if dry_run:
+            # Format once so the dry-run preview is exactly what a real run sends.
             trend_message, summary_message = notifier.format_weekly_push_messages(
                 report,
                 week_start,
                 week_end,
                 summary
             )
-            print("\n🔍 DRY RUN - Weekly trend message:\n")
-            print(trend_message)
-            print("\n🔍 DRY RUN - Weekly summary message:\n")
-            print(summary_message)
-        else:
-            success = notifier.send_weekly_report_split(
-                report,
-                week_start,
-                week_end,
-                summary
-            )
-            if success:
-                logger.info("✓ Weekly split report sent successfully")
+            if dry_run:
+                print("\n🔍 DRY RUN - Weekly trend message:\n")
+                print(trend_message)
+                print("\n🔍 DRY RUN - Weekly summary message:\n")
+                print(summary_message)
             else:
-                logger.error("✗ Failed to send split weekly report")
+                success = notifier.send_prepared(trend_message, summary_message)
+                if success:
+                    logger.info("✓ Weekly split report sent successfully")
+                else:
+                    logger.error("✗ Failed to send split weekly report")
+
+            try:
+                history_future.result()
+                logger.info("✓ Weekly report saved to %s", history_file)
+            except Exception as e:
+                logger.error("Failed to save history: %s", e)
 
     except Exception as e:
-        logger.error(f"Weekly task failed: {e}", exc_info=True)
+        logger.error("Weekly task failed: %s", e, exc_info=True)
         if not dry_run:
             notifier.send_markdown(f"⚠️ 周报生成失败：{str(e)}")
         raise
 
     finally:
+        notifier.close()
         db.close()
 
 
-def main():
-    """Main entry point"""
+@lru_cache(maxsize=None)
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser once; parse_args leaves it unchanged."""
     parser = argparse.ArgumentParser(description='GitHub AI Trend Tracker - Weekly Report')
     parser.add_argument('--config', default='config/config.yaml', help='Config file path')
     parser.add_argument('--dry-run', action='store_true', help='Run without sending notifications')
-    parser.add_argument('--week-start', help='Week start date (YYYY-MM-DD), default: this week Monday')
+    parser.add_argument('--week-start', help='Week start date (YYYY-MM-DD), snapped to its Monday; default: this week Monday')
+    return parser
 
-    args = parser.parse_args()
+
+def main():
+    """Main entry point"""
+    args = build_parser().parse_args()
 
     # Parse week start
     week_start = None
@@ -180,6 +180,8 @@ def main():
         return 0
     except Exception:
         return 1
+    finally:
+        stop_logging()
 
 
 if __name__ == '__main__':